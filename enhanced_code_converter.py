@@ -46,6 +46,9 @@ except ImportError as e:
     print(f"Warning: Phase 2 features not available: {e}")
     PHASE2_AVAILABLE = False
 
+# Encodings tried, in order, when reading source files
+SOURCE_ENCODINGS = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
+
 class EnhancedCodeConverter:
     def __init__(self, use_ai: bool = False, model_name: str = "gemma-3n-2b", use_kaggle: bool = True, 
                  auto_select_model: bool = True, enable_phase2: bool = False):
@@ -287,6 +290,18 @@ Java Code:"""
             'ai_used': self.use_ai
         }
         
+        # Generate AI conversions for the whole project in one batch when the
+        # integration supports it, instead of one model call per file. The
+        # sources read for the batch are reused when converting each file
+        ai_results = {}
+        source_codes = {}
+        if self.use_ai and hasattr(self.ai_integration, 'generate_batch'):
+            for source_file in source_files:
+                source_code = self._read_source_file(source_file)
+                if source_code is not None:
+                    source_codes[source_file] = source_code
+            ai_results = self._convert_batch_with_ai(source_codes, config)
+        
         # Convert each file
         for source_file in source_files:
             try:
@@ -298,7 +313,9 @@ Java Code:"""
                 
                 # Convert the file
                 conversion_result = self._convert_file(
-                    source_file, target_file, conversion_type, config
+                    source_file, target_file, conversion_type, config,
+                    ai_result=ai_results.get(source_file),
+                    source_code=source_codes.get(source_file)
                 )
                 
                 results['files_converted'].append({
@@ -363,28 +380,37 @@ Java Code:"""
                     source_files.append(file)
         return sorted(source_files)
     
-    def _convert_file(self, source_file: Path, target_file: Path, conversion_type: str, config: Dict) -> Dict:
-        """Convert a single file using AI or basic conversion"""
+    def _read_source_file(self, source_file: Path) -> Optional[str]:
+        """Read a source file, trying several encodings; None if none of them work"""
+        for encoding in SOURCE_ENCODINGS:
+            try:
+                with open(source_file, 'r', encoding=encoding) as f:
+                    return f.read()
+            except UnicodeDecodeError:
+                continue
+        return None
+    
+    def _convert_file(self, source_file: Path, target_file: Path, conversion_type: str, config: Dict,
+                      ai_result: Optional[Dict] = None, source_code: Optional[str] = None) -> Dict:
+        """Convert a single file using AI or basic conversion
+        
+        ai_result is a result from _convert_batch_with_ai; when given, it is
+        used instead of calling the AI integration for this file. source_code
+        is the file's already decoded text, if the caller has read it.
+        """
         try:
             # Try different encodings to handle various file formats
-            encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-            source_code = None
-            
-            for encoding in encodings:
-                try:
-                    with open(source_file, 'r', encoding=encoding) as f:
-                        source_code = f.read()
-                    break
-                except UnicodeDecodeError:
-                    continue
+            if source_code is None:
+                source_code = self._read_source_file(source_file)
             
             if source_code is None:
-                return {'status': 'error', 'error': f'Could not decode file with any encoding: {encodings}'}
+                return {'status': 'error', 'error': f'Could not decode file with any encoding: {SOURCE_ENCODINGS}'}
             
             # Try AI conversion first if available
             if self.use_ai:
                 try:
-                    ai_result = self._convert_with_ai(source_code, conversion_type, config)
+                    if ai_result is None:
+                        ai_result = self._convert_with_ai(source_code, conversion_type, config)
                     if ai_result['success']:
                         converted_code = ai_result['code']
                         with open(target_file, 'w', encoding='utf-8') as f:
@@ -582,6 +608,29 @@ Java Code:"""
         
         return round(total_change / valid_results, 2) if valid_results > 0 else 0.0
     
+    def _convert_batch_with_ai(self, source_codes: Dict[Path, str], config: Dict) -> Dict[Path, Dict]:
+        """Convert source files, given as path -> decoded text, with one batched AI call"""
+        batch_files = list(source_codes)
+        prompts = [config['ai_prompt_template'].format(source_code=source_code)
+                   for source_code in source_codes.values()]
+        
+        if not prompts:
+            return {}
+        
+        try:
+            responses = self.ai_integration.generate_batch(prompts)
+        except Exception as e:
+            print(f"Batched AI conversion failed: {e}")
+            return {}
+        
+        ai_results = {}
+        for source_file, response in zip(batch_files, responses):
+            if response and response.strip():
+                ai_results[source_file] = {'success': True, 'code': response.strip()}
+            else:
+                ai_results[source_file] = {'success': False, 'error': 'Empty AI response'}
+        return ai_results
+    
     def _convert_with_ai(self, source_code: str, conversion_type: str, config: Dict) -> Dict:
         """Convert code using AI integration"""
         prompt = config['ai_prompt_template'].format(source_code=source_code)
@@ -8,20 +8,61 @@ secure code scanning, and data encryption features.
 
 import os
 import json
+import shutil
+import tempfile
 import hashlib
 import hmac
 import base64
 import logging
+import mmap
 import time
-from datetime import datetime, timedelta
+import atexit
+import struct
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Tuple, Any, Optional
 from enum import Enum
 import jwt
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import re
-from collections import defaultdict
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, with orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+def _json_loads(data: bytes) -> Any:
+    """Parse UTF-8 JSON, with orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+_NEWLINE_PATTERN = re.compile(b'\n')
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
 
 class SecurityLevel(Enum):
     """Security levels for different operations."""
@@ -39,14 +80,44 @@ class UserRole(Enum):
     SUPER_ADMIN = "super_admin"
 
 class RBACManager:
-    """Role-Based Access Control manager."""
+    """Role-Based Access Control manager.
+    
+    The full user and role data lives in a JSON snapshot at db_path. Each
+    mutation only appends the changed user record to a journal file next to
+    it; the journal is replayed on load and folded back into the snapshot
+    once it holds compact_threshold entries. Snapshots are written to a temp
+    file and swapped in with os.replace, so a crash never leaves a partial one.
     
-    def __init__(self, db_path: str = "instance/security.db"):
+    Journal appends are coalesced: mutations queue the changed record and a
+    timer writes everything queued within flush_delay seconds in one append.
+    Call flush() to persist immediately; it also runs at interpreter exit.
+    """
+    
+    def __init__(self, db_path: str = "instance/security.db", compact_threshold: int = 1000,
+                 check_cache_ttl: float = 60.0, check_cache_size: int = 10000,
+                 flush_delay: float = 0.25):
         self.db_path = db_path
+        self.journal_path = db_path + '.journal'
+        self.compact_threshold = compact_threshold
+        self.flush_delay = flush_delay
+        self.check_cache_ttl = check_cache_ttl
+        self.check_cache_size = check_cache_size
         self.users = {}
         self.roles = {}
+        self._journal_entries = 0
         self.permissions = self._load_permissions()
+        self._perm_bit, self._role_mask = self._compile_permissions(self.permissions)
+        # Per-user caches, filled on first lookup and dropped on role changes
+        self._role_by_user: Dict[str, UserRole] = {}
+        self._mask_by_user: Dict[str, int] = {}
+        # (user_id, permission) -> (expiry, allowed), for grants and denials alike
+        self._check_cache: Dict[Tuple[str, str], Tuple[float, bool]] = {}
+        # user_id -> serialized journal line waiting for the next flush
+        self._pending: Dict[str, bytes] = {}
+        self._flush_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
         self._load_data()
+        atexit.register(self.flush)
     
     def _load_permissions(self) -> Dict[str, List[str]]:
         """Load permission definitions for each role."""
@@ -109,31 +180,97 @@ class RBACManager:
             ]
         }
     
+    @staticmethod
+    def _compile_permissions(permissions: Dict[UserRole, List[str]]) -> Tuple[Dict[str, int], Dict[UserRole, int]]:
+        """Assign each permission a bit and build one bitmask per role."""
+        all_permissions = sorted({perm for perms in permissions.values() for perm in perms})
+        perm_bit = {perm: bit for bit, perm in enumerate(all_permissions)}
+        role_mask = {
+            role: sum(1 << perm_bit[perm] for perm in set(perms))
+            for role, perms in permissions.items()
+        }
+        return perm_bit, role_mask
+    
     def _load_data(self):
         """Load user and role data from storage."""
         try:
             if os.path.exists(self.db_path):
-                with open(self.db_path, 'r') as f:
-                    data = json.load(f)
+                with open(self.db_path, 'rb') as f:
+                    data = _json_loads(f.read())
                     self.users = data.get('users', {})
                     self.roles = data.get('roles', {})
+            self._replay_journal()
         except Exception as e:
             logging.error(f"Error loading RBAC data: {e}")
             self.users = {}
             self.roles = {}
     
+    def _replay_journal(self):
+        """Apply user records appended since the last snapshot."""
+        self._journal_entries = 0
+        if not os.path.exists(self.journal_path):
+            return
+        
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                try:
+                    entry = _json_loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from an interrupted append
+                    continue
+                self.users[entry['user_id']] = entry['user']
+                self._journal_entries += 1
+    
     def _save_data(self):
-        """Save user and role data to storage."""
+        """Save a full snapshot of user and role data and reset the journal."""
         try:
             os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-            with open(self.db_path, 'w') as f:
-                json.dump({
+            temp_path = self.db_path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(_json_dumps({
                     'users': self.users,
                     'roles': self.roles
-                }, f, indent=2)
+                }))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.db_path)
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            self._journal_entries = 0
         except Exception as e:
             logging.error(f"Error saving RBAC data: {e}")
     
+    def _save_user(self, user_id: str):
+        """Queue one user's record for the next journal flush."""
+        line = _json_dumps({'user_id': user_id, 'user': self.users[user_id]}) + b'\n'
+        with self._flush_lock:
+            self._pending[user_id] = line
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def flush(self):
+        """Append queued user records to the journal in one write."""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending:
+                return
+            
+            try:
+                os.makedirs(os.path.dirname(self.journal_path), exist_ok=True)
+                with open(self.journal_path, 'ab') as f:
+                    f.write(b''.join(self._pending.values()))
+                self._journal_entries += len(self._pending)
+                self._pending.clear()
+                
+                if self._journal_entries >= self.compact_threshold:
+                    self._save_data()
+            except Exception as e:
+                logging.error(f"Error saving RBAC data: {e}")
+    
     def create_user(self, user_id: str, username: str, email: str, 
                    role: UserRole = UserRole.USER) -> bool:
         """Create a new user with specified role."""
@@ -149,8 +286,9 @@ class RBACManager:
                 'last_login': None,
                 'active': True
             }
+            self._check_cache.clear()
             
-            self._save_data()
+            self._save_user(user_id)
             return True
             
         except Exception as e:
@@ -165,24 +303,50 @@ class RBACManager:
             
             self.users[user_id]['role'] = new_role.value
             self.users[user_id]['updated_at'] = datetime.now().isoformat()
+            self._role_by_user.pop(user_id, None)
+            self._mask_by_user.pop(user_id, None)
+            self._check_cache.clear()
             
-            self._save_data()
+            self._save_user(user_id)
             return True
             
         except Exception as e:
             logging.error(f"Error updating user role: {e}")
             return False
     
+    def _get_user_role(self, user_id: str) -> UserRole:
+        """Get a user's role, coercing the stored value only once."""
+        user_role = self._role_by_user.get(user_id)
+        if user_role is None:
+            user_role = UserRole(self.users[user_id]['role'])
+            self._role_by_user[user_id] = user_role
+        return user_role
+    
     def check_permission(self, user_id: str, permission: str) -> bool:
         """Check if user has specific permission."""
         try:
-            if user_id not in self.users:
-                return False
+            key = (user_id, permission)
+            now = time.monotonic()
+            cached = self._check_cache.get(key)
+            if cached is not None and cached[0] > now:
+                return cached[1]
             
-            user_role = UserRole(self.users[user_id]['role'])
-            user_permissions = self.permissions.get(user_role, [])
+            user_mask = self._mask_by_user.get(user_id)
+            if user_mask is None:
+                if user_id in self.users:
+                    user_mask = self._role_mask.get(self._get_user_role(user_id), 0)
+                    self._mask_by_user[user_id] = user_mask
+                else:
+                    user_mask = 0
             
-            return permission in user_permissions
+            bit = self._perm_bit.get(permission)
+            allowed = bit is not None and bool((user_mask >> bit) & 1)
+            
+            if len(self._check_cache) >= self.check_cache_size:
+                self._check_cache.clear()
+            self._check_cache[key] = (now + self.check_cache_ttl, allowed)
+            
+            return allowed
             
         except Exception as e:
             logging.error(f"Error checking permission: {e}")
@@ -194,7 +358,7 @@ class RBACManager:
             if user_id not in self.users:
                 return []
             
-            user_role = UserRole(self.users[user_id]['role'])
+            user_role = self._get_user_role(user_id)
             return self.permissions.get(user_role, [])
             
         except Exception as e:
@@ -202,39 +366,200 @@ class RBACManager:
             return []
 
 class AuditLogger:
-    """Audit logging system for compliance and security."""
+    """Audit logging system for compliance and security.
+    
+    Events are written as one JSON object per line (JSONL), each with a
+    single unbuffered append made while holding an exclusive lock on the
+    log (flock where available), so several processes can share one log.
+    
+    Alongside the log, a binary index file holds one fixed-size record per
+    event (byte offset, length, timestamp and hashes of user and action), so
+    queries only read and parse the events that match their filters. Offsets
+    are read back from the log file after each write rather than counted in
+    memory, so they stay correct when other processes append in between.
+    """
+    
+    # offset, length, timestamp (microseconds), crc32(user_id), crc32(action)
+    INDEX_RECORD = struct.Struct('<QIqII')
     
     def __init__(self, log_path: str = "instance/audit.log"):
         self.log_path = log_path
+        # Index keys are UTC; '.idx' files written before that keyed local
+        # times as if they were UTC, so they are left to be replaced
+        self.index_path = log_path + '.utc.idx'
+        self._remove_legacy_index(log_path + '.idx')
         self.logger = self._setup_logger()
+        self._lock = threading.Lock()
+        self.log_file = self._open_log_file()
+        with self._locked():
+            self.index_file = self._open_index_file()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reopen_after_fork)
+        atexit.register(self.close)
     
     def _setup_logger(self):
         """Setup audit logger."""
         logger = logging.getLogger('audit')
         logger.setLevel(logging.INFO)
-        
-        # Create file handler
+        return logger
+    
+    @staticmethod
+    def _remove_legacy_index(legacy_path: str):
+        """Delete an index file in the old local-time format, if there is one."""
+        try:
+            os.remove(legacy_path)
+        except OSError:
+            pass
+    
+    def _open_log_file(self):
+        """Open the audit log for unbuffered appends."""
         os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
-        file_handler = logging.FileHandler(self.log_path)
-        file_handler.setLevel(logging.INFO)
+        return open(self.log_path, 'ab', buffering=0)
+    
+    def _open_index_file(self):
+        """Open the audit index for appends, rebuilding it if it is stale."""
+        if not self._index_is_current():
+            self._rebuild_index()
+        return open(self.index_path, 'a+b', buffering=0)
+    
+    def _reopen_after_fork(self):
+        """Give a forked child its own file handles.
+        
+        flock locks belong to the open file, which a child inherits from its
+        parent, so without this a preloaded logger would lock nothing
+        between the processes sharing it.
+        """
+        self._lock = threading.Lock()
+        if not self.log_file.closed:
+            self.log_file.close()
+            self.index_file.close()
+            self.log_file = self._open_log_file()
+            self.index_file = open(self.index_path, 'a+b', buffering=0)
+    
+    @contextmanager
+    def _locked(self):
+        """Hold the thread lock and, where supported, an exclusive flock on the log."""
+        with self._lock:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(self.log_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if FCNTL_AVAILABLE:
+                    fcntl.flock(self.log_file.fileno(), fcntl.LOCK_UN)
+    
+    @staticmethod
+    def _write_all(file, data: bytes):
+        """Write all of data to an unbuffered file, retrying short writes."""
+        view = memoryview(data)
+        while view:
+            view = view[file.write(view):]
+    
+    def _index_is_current(self) -> bool:
+        """Check that the index ends exactly where the log ends."""
+        log_size = os.path.getsize(self.log_path)
+        if not os.path.exists(self.index_path):
+            return log_size == 0
         
-        # Create formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s'
+        index_size = os.path.getsize(self.index_path)
+        record_size = self.INDEX_RECORD.size
+        if index_size % record_size:
+            return False
+        if index_size == 0:
+            return log_size == 0
+        
+        with open(self.index_path, 'rb') as f:
+            f.seek(index_size - record_size)
+            offset, length, _, _, _ = self.INDEX_RECORD.unpack(f.read(record_size))
+        return offset + length == log_size
+    
+    def _rebuild_index(self):
+        """Rebuild the index by scanning the whole log once."""
+        offset = 0
+        last_key = None
+        with open(self.log_path, 'rb') as log, open(self.index_path, 'wb') as index:
+            for line in log:
+                log_entry = self._parse_line(line)
+                if log_entry is not None:
+                    timestamp = datetime.fromisoformat(log_entry['timestamp'])
+                    if timestamp.tzinfo is None:
+                        # Older events were recorded in naive local time
+                        timestamp = timestamp.astimezone()
+                    last_key = self._ordered_key(self._timestamp_key(timestamp), last_key)
+                    index.write(self._index_record(
+                        offset, len(line), last_key,
+                        log_entry.get('user_id'), log_entry.get('action')
+                    ))
+                offset += len(line)
+    
+    def _index_record(self, offset: int, length: int, timestamp_key: int,
+                      user_id: str, action: str) -> bytes:
+        """Pack one index record."""
+        return self.INDEX_RECORD.pack(
+            offset, length, timestamp_key,
+            self._hash_key(user_id), self._hash_key(action)
         )
-        file_handler.setFormatter(formatter)
+    
+    @staticmethod
+    def _ordered_key(key: int, last_key: Optional[int]) -> int:
+        """Index key for an event, never below the previous record's.
         
-        # Add handler to logger
-        logger.addHandler(file_handler)
+        Queries rely on index keys never decreasing, but a clock stepped back
+        or a DST change can make event times do so. Only the key is raised;
+        the event keeps its real timestamp.
+        """
+        return key if last_key is None or key >= last_key else last_key
+    
+    @staticmethod
+    def _timestamp_key(timestamp: datetime) -> int:
+        """Microseconds since the epoch; naive timestamps are taken as UTC."""
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        return (timestamp - _EPOCH) // _MICROSECOND
+    
+    def _last_timestamp_key(self) -> Optional[int]:
+        """Timestamp key of the last record in the index, if any."""
+        record_size = self.INDEX_RECORD.size
+        size = os.fstat(self.index_file.fileno()).st_size // record_size * record_size
+        if not size:
+            return None
+        # Appends still go to the end of the file after this seek
+        self.index_file.seek(size - record_size)
+        return self.INDEX_RECORD.unpack(self.index_file.read(record_size))[2]
+    
+    @staticmethod
+    def _hash_key(value: Optional[str]) -> int:
+        """Stable hash used to pre-filter index records."""
+        return zlib.crc32(str(value).encode('utf-8'))
+    
+    @staticmethod
+    def _parse_line(line: bytes) -> Optional[Dict[str, Any]]:
+        """Parse one log line, or return None if it is not an audit event."""
+        # Older logs prefix each event with the logging formatter output
+        marker = line.find(b'AUDIT: ')
+        if marker != -1:
+            line = line[marker + 7:]
+        elif not line.startswith(b'{'):
+            return None
         
-        return logger
+        try:
+            return _json_loads(line)
+        except json.JSONDecodeError:
+            return None
     
     def log_event(self, user_id: str, action: str, resource: str, 
                   details: Dict[str, Any] = None, security_level: SecurityLevel = SecurityLevel.MEDIUM):
-        """Log an audit event."""
+        """Log an audit event.
+        
+        Nothing is built or written when the 'audit' logger has been set
+        above INFO, so audit logging can be switched off without cost.
+        """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
         try:
             event = {
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': None,
                 'user_id': user_id,
                 'action': action,
                 'resource': resource,
@@ -244,11 +569,32 @@ class AuditLogger:
                 'user_agent': self._get_user_agent()
             }
             
-            self.logger.info(f"AUDIT: {json.dumps(event)}")
+            with self._locked():
+                # Taken in UTC under the lock, so events from all threads and
+                # processes reach the index in time order
+                timestamp = datetime.now(timezone.utc)
+                timestamp_key = self._ordered_key(self._timestamp_key(timestamp),
+                                                  self._last_timestamp_key())
+                event['timestamp'] = timestamp.isoformat()
+                line = _json_dumps(event) + b'\n'
+                
+                # The log is written before the index so the index never
+                # points past it; the lock keeps our line where tell() says
+                self._write_all(self.log_file, line)
+                offset = self.log_file.tell() - len(line)
+                self._write_all(self.index_file, self._index_record(
+                    offset, len(line), timestamp_key, user_id, action))
             
         except Exception as e:
             logging.error(f"Error logging audit event: {e}")
     
+    def close(self):
+        """Close the audit log and index files."""
+        with self._lock:
+            if not self.log_file.closed:
+                self.log_file.close()
+                self.index_file.close()
+    
     def _get_client_ip(self) -> str:
         """Get client IP address (placeholder)."""
         return "127.0.0.1"  # In real implementation, get from request
@@ -257,37 +603,71 @@ class AuditLogger:
         """Get user agent (placeholder)."""
         return "CodeConverter/1.0"  # In real implementation, get from request
     
+    def _find_first_record(self, index: mmap.mmap, start_key: int) -> int:
+        """Binary search the index for the first record at or after start_key."""
+        record_size = self.INDEX_RECORD.size
+        low, high = 0, len(index) // record_size
+        while low < high:
+            middle = (low + high) // 2
+            if self.INDEX_RECORD.unpack_from(index, middle * record_size)[2] < start_key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+    
     def get_audit_logs(self, start_date: datetime = None, end_date: datetime = None,
                       user_id: str = None, action: str = None) -> List[Dict[str, Any]]:
-        """Retrieve audit logs with filtering."""
+        """Retrieve audit logs with filtering.
+        
+        Events are appended in time order, so a date range is located with a
+        binary search over the index and the scan stops at end_date; queries
+        for recent events cost time proportional to the result, not the log.
+        Event timestamps are in UTC, and naive dates are taken as UTC.
+        """
         try:
             logs = []
             
-            if not os.path.exists(self.log_path):
+            if not os.path.exists(self.index_path):
                 return logs
             
-            with open(self.log_path, 'r') as f:
-                for line in f:
-                    if 'AUDIT:' in line:
-                        try:
-                            # Extract JSON from log line
-                            json_str = line.split('AUDIT: ')[1].strip()
-                            log_entry = json.loads(json_str)
-                            
-                            # Apply filters
-                            if start_date and datetime.fromisoformat(log_entry['timestamp']) < start_date:
-                                continue
-                            if end_date and datetime.fromisoformat(log_entry['timestamp']) > end_date:
-                                continue
-                            if user_id and log_entry['user_id'] != user_id:
-                                continue
-                            if action and log_entry['action'] != action:
-                                continue
-                            
-                            logs.append(log_entry)
-                            
-                        except json.JSONDecodeError:
+            start_key = self._timestamp_key(start_date) if start_date else None
+            end_key = self._timestamp_key(end_date) if end_date else None
+            user_key = self._hash_key(user_id) if user_id else None
+            action_key = self._hash_key(action) if action else None
+            
+            with open(self.index_path, 'rb') as f, open(self.log_path, 'rb') as log:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return logs
+                
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as index:
+                    record_size = self.INDEX_RECORD.size
+                    end = len(index) // record_size * record_size
+                    first = self._find_first_record(index, start_key) if start_key is not None else 0
+                    
+                    for position in range(first * record_size, end, record_size):
+                        offset, length, timestamp, user_hash, action_hash = \
+                            self.INDEX_RECORD.unpack_from(index, position)
+                        
+                        # Apply filters against the index before touching the log
+                        if end_key is not None and timestamp > end_key:
+                            break
+                        if user_key is not None and user_hash != user_key:
+                            continue
+                        if action_key is not None and action_hash != action_key:
                             continue
+                        
+                        log.seek(offset)
+                        log_entry = self._parse_line(log.read(length))
+                        if log_entry is None:
+                            continue
+                        
+                        # Hashes can collide, so confirm the exact values
+                        if user_id and log_entry['user_id'] != user_id:
+                            continue
+                        if action and log_entry['action'] != action:
+                            continue
+                        
+                        logs.append(log_entry)
             
             return logs
             
@@ -298,13 +678,23 @@ class AuditLogger:
 class SecureCodeScanner:
     """Secure code scanning for vulnerabilities."""
     
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None, parallel_threshold: int = 64):
+        self.max_workers = max_workers or os.cpu_count()
+        self.parallel_threshold = parallel_threshold
         self.vulnerability_patterns = self._load_vulnerability_patterns()
         self.security_rules = self._load_security_rules()
+        self.type_patterns = self._build_type_patterns()
+        self.combined_pattern = self._build_combined_pattern()
+        self._ext_by_lang = {
+            'python': ('.py',),
+            'javascript': ('.js', '.jsx', '.ts', '.tsx'),
+            'java': ('.java',),
+            'c': ('.c', '.h', '.cpp', '.hpp')
+        }
     
-    def _load_vulnerability_patterns(self) -> Dict[str, List[str]]:
-        """Load vulnerability detection patterns."""
-        return {
+    def _load_vulnerability_patterns(self) -> Dict[str, List[re.Pattern]]:
+        """Load vulnerability detection patterns, compiled once per scanner as bytes patterns."""
+        patterns = {
             'sql_injection': [
                 r'execute\s*\(\s*[\'"][^\'"]*\+.*[\'"]',
                 r'query\s*\(\s*[\'"][^\'"]*\+.*[\'"]',
@@ -334,6 +724,34 @@ class SecureCodeScanner:
                 r'crypto\.createHash\s*\(\s*[\'"]md5[\'"]',
             ]
         }
+        
+        return {
+            vuln_type: [re.compile(pattern.encode('utf-8'), re.IGNORECASE) for pattern in type_patterns]
+            for vuln_type, type_patterns in patterns.items()
+        }
+    
+    def _build_type_patterns(self) -> Dict[str, re.Pattern]:
+        """Join the patterns of each vulnerability type into one alternation."""
+        return {
+            vuln_type: re.compile(
+                b'|'.join(b'(?:' + pattern.pattern + b')' for pattern in patterns),
+                re.IGNORECASE
+            )
+            for vuln_type, patterns in self.vulnerability_patterns.items()
+        }
+    
+    def _build_combined_pattern(self) -> re.Pattern:
+        """Join every vulnerability type into one alternation of named groups.
+        
+        A single search over the file tells us whether any pattern can match
+        at all, which type matches first, and where: no pattern can match
+        before that offset, so later passes start from it.
+        """
+        alternatives = [
+            b'(?P<' + vuln_type.encode('ascii') + b'>' + pattern.pattern + b')'
+            for vuln_type, pattern in self.type_patterns.items()
+        ]
+        return re.compile(b'|'.join(alternatives), re.IGNORECASE)
     
     def _load_security_rules(self) -> Dict[str, Dict[str, Any]]:
         """Load security rules and severity levels."""
@@ -368,25 +786,14 @@ class SecureCodeScanner:
     def scan_file(self, file_path: str, language: str) -> Dict[str, Any]:
         """Scan a file for security vulnerabilities."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            vulnerabilities = []
-            
-            for vuln_type, patterns in self.vulnerability_patterns.items():
-                for pattern in patterns:
-                    matches = re.finditer(pattern, content, re.IGNORECASE)
-                    for match in matches:
-                        vulnerability = {
-                            'type': vuln_type,
-                            'line': content[:match.start()].count('\n') + 1,
-                            'column': match.start() - content.rfind('\n', 0, match.start()),
-                            'code': match.group(),
-                            'severity': self.security_rules[vuln_type]['severity'].value,
-                            'description': self.security_rules[vuln_type]['description'],
-                            'mitigation': self.security_rules[vuln_type]['mitigation']
-                        }
-                        vulnerabilities.append(vulnerability)
+            # Map the file and match the bytes in place instead of reading
+            # and decoding it; only matched snippets are decoded.
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    vulnerabilities = []
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                        vulnerabilities = self._find_vulnerabilities(content)
             
             return {
                 'file_path': file_path,
@@ -403,6 +810,55 @@ class SecureCodeScanner:
                 'error': str(e)
             }
     
+    def _find_vulnerabilities(self, content: bytes) -> List[Dict[str, Any]]:
+        """Run the vulnerability patterns over raw UTF-8 file content."""
+        vulnerabilities = []
+        
+        first_match = self.combined_pattern.search(content)
+        if first_match is None:
+            return vulnerabilities
+        
+        # Offsets of every newline, so each match resolves its line with a
+        # binary search instead of re-counting the file prefix.
+        newlines = [match.start() for match in _NEWLINE_PATTERN.finditer(content)]
+        
+        for vuln_type, patterns in self.vulnerability_patterns.items():
+            # One pass per type finds its earliest hit; the individual
+            # patterns only run for types that are present, from that offset.
+            if vuln_type == first_match.lastgroup:
+                type_start = first_match.start()
+            else:
+                type_match = self.type_patterns[vuln_type].search(content, first_match.start())
+                if type_match is None:
+                    continue
+                type_start = type_match.start()
+            
+            rule = self.security_rules[vuln_type]
+            severity = rule['severity'].value
+            description = rule['description']
+            mitigation = rule['mitigation']
+            
+            for pattern in patterns:
+                for match in pattern.finditer(content, type_start):
+                    start = match.start()
+                    line_index = bisect_left(newlines, start)
+                    line_start = newlines[line_index - 1] + 1 if line_index else 0
+                    # Columns count characters, so decode the line prefix if it is not ASCII
+                    prefix = content[line_start:start]
+                    column = len(prefix) if prefix.isascii() else len(prefix.decode('utf-8', 'replace'))
+                    vulnerability = {
+                        'type': vuln_type,
+                        'line': line_index + 1,
+                        'column': column + 1,
+                        'code': match.group().decode('utf-8', 'replace'),
+                        'severity': severity,
+                        'description': description,
+                        'mitigation': mitigation
+                    }
+                    vulnerabilities.append(vulnerability)
+        
+        return vulnerabilities
+    
     def _calculate_risk_score(self, vulnerabilities: List[Dict[str, Any]]) -> int:
         """Calculate overall risk score for vulnerabilities."""
         score = 0
@@ -427,28 +883,29 @@ class SecureCodeScanner:
                 'language': language,
                 'files_scanned': 0,
                 'total_vulnerabilities': 0,
-                'vulnerabilities_by_type': defaultdict(int),
+                'vulnerabilities_by_type': {},
                 'files_with_vulnerabilities': [],
                 'overall_risk_score': 0
             }
             
-            for root, dirs, files in os.walk(project_path):
-                for file in files:
-                    if self._is_source_file(file, language):
-                        file_path = os.path.join(root, file)
-                        file_scan = self.scan_file(file_path, language)
-                        
-                        project_scan['files_scanned'] += 1
-                        
-                        if 'vulnerabilities' in file_scan:
-                            project_scan['total_vulnerabilities'] += file_scan['total_vulnerabilities']
-                            project_scan['overall_risk_score'] += file_scan['risk_score']
-                            
-                            if file_scan['vulnerabilities']:
-                                project_scan['files_with_vulnerabilities'].append(file_scan)
-                                
-                                for vuln in file_scan['vulnerabilities']:
-                                    project_scan['vulnerabilities_by_type'][vuln['type']] += 1
+            extensions = self._ext_by_lang.get(language, ())
+            file_paths = list(self._iter_source_files(project_path, extensions))
+            
+            vulnerabilities_by_type = Counter()
+            for file_scan in self._scan_files(file_paths, language):
+                project_scan['files_scanned'] += 1
+                
+                if 'vulnerabilities' in file_scan:
+                    project_scan['total_vulnerabilities'] += file_scan['total_vulnerabilities']
+                    project_scan['overall_risk_score'] += file_scan['risk_score']
+                    
+                    if file_scan['vulnerabilities']:
+                        project_scan['files_with_vulnerabilities'].append(file_scan)
+                        vulnerabilities_by_type.update(
+                            vuln['type'] for vuln in file_scan['vulnerabilities']
+                        )
+            
+            project_scan['vulnerabilities_by_type'] = dict(vulnerabilities_by_type)
             
             # Normalize risk score
             if project_scan['files_scanned'] > 0:
@@ -466,26 +923,75 @@ class SecureCodeScanner:
                 'error': str(e)
             }
     
+    def _iter_source_files(self, directory: str, extensions: Tuple[str, ...]):
+        """Yield matching files under directory, in the same order as os.walk.
+        
+        Uses os.scandir so file type checks come from the cached directory
+        entry instead of extra stat calls. Symlinked directories are not
+        followed and unreadable directories are skipped, as with os.walk.
+        """
+        try:
+            with os.scandir(directory) as entries:
+                subdirectories = []
+                for entry in entries:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            subdirectories.append(entry.path)
+                    elif entry.name.endswith(extensions):
+                        yield entry.path
+        except OSError:
+            return
+        
+        for subdirectory in subdirectories:
+            yield from self._iter_source_files(subdirectory, extensions)
+    
+    def _scan_files(self, file_paths: List[str], language: str) -> List[Dict[str, Any]]:
+        """Scan files, fanning out to worker processes for larger projects."""
+        if len(file_paths) < self.parallel_threshold:
+            return [self.scan_file(file_path, language) for file_path in file_paths]
+        
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                return list(executor.map(self.scan_file, file_paths,
+                                         [language] * len(file_paths), chunksize=16))
+        except (OSError, BrokenProcessPool) as e:
+            logging.warning(f"Parallel scan unavailable, scanning sequentially: {e}")
+            return [self.scan_file(file_path, language) for file_path in file_paths]
+    
     def _is_source_file(self, filename: str, language: str) -> bool:
         """Check if file is a source file for the given language."""
-        extensions = {
-            'python': ['.py'],
-            'javascript': ['.js', '.jsx', '.ts', '.tsx'],
-            'java': ['.java'],
-            'c': ['.c', '.h', '.cpp', '.hpp']
-        }
-        
-        if language in extensions:
-            return any(filename.endswith(ext) for ext in extensions[language])
-        return False
+        return filename.endswith(self._ext_by_lang.get(language, ()))
 
 class DataEncryption:
-    """Data encryption for sensitive information."""
+    """Data encryption for sensitive information.
+    
+    Strings are encrypted with Fernet. Files are streamed through AES-256-GCM
+    in CHUNK_SIZE chunks under a key derived from the Fernet key, so memory
+    use does not grow with file size. Encrypted files start with FILE_MAGIC
+    so files encrypted with Fernet by earlier versions can still be decrypted.
+    """
+    
+    # Every Fernet token starts with its version byte 0x80, "gAAAAA" in base64
+    TOKEN_PREFIX = b'gAAAAA'
+    FILE_MAGIC = b'CTE\x02'
+    NONCE_PREFIX_SIZE = 7
+    CHUNK_SIZE = 1 << 20
+    CHUNK_HEADER = struct.Struct('>I')
     
     def __init__(self, key_file: str = "instance/encryption.key"):
         self.key_file = key_file
         self.key = self._load_or_generate_key()
         self.cipher = Fernet(self.key)
+        self.file_cipher = AESGCM(self._derive_file_key())
+    
+    def _derive_file_key(self) -> bytes:
+        """Derive a separate AES-256 key for file encryption."""
+        return HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=b'CodeConverter file encryption',
+        ).derive(base64.urlsafe_b64decode(self.key))
     
     def _load_or_generate_key(self) -> bytes:
         """Load existing key or generate new one."""
@@ -507,8 +1013,8 @@ class DataEncryption:
     def encrypt_data(self, data: str) -> str:
         """Encrypt sensitive data."""
         try:
-            encrypted_data = self.cipher.encrypt(data.encode('utf-8'))
-            return base64.b64encode(encrypted_data).decode('utf-8')
+            # Fernet tokens are already URL-safe base64
+            return self.cipher.encrypt(data.encode('utf-8')).decode('ascii')
         except Exception as e:
             logging.error(f"Error encrypting data: {e}")
             return data
@@ -516,9 +1022,12 @@ class DataEncryption:
     def decrypt_data(self, encrypted_data: str) -> str:
         """Decrypt sensitive data."""
         try:
-            decoded_data = base64.b64decode(encrypted_data.encode('utf-8'))
-            decrypted_data = self.cipher.decrypt(decoded_data)
-            return decrypted_data.decode('utf-8')
+            token = encrypted_data.encode('ascii')
+            if not token.startswith(self.TOKEN_PREFIX):
+                # Values stored before tokens were returned as-is were
+                # base64-encoded a second time
+                token = base64.b64decode(token)
+            return self.cipher.decrypt(token).decode('utf-8')
         except Exception as e:
             logging.error(f"Error decrypting data: {e}")
             return encrypted_data
@@ -526,14 +1035,7 @@ class DataEncryption:
     def encrypt_file(self, file_path: str) -> bool:
         """Encrypt a file in place."""
         try:
-            with open(file_path, 'rb') as f:
-                data = f.read()
-            
-            encrypted_data = self.cipher.encrypt(data)
-            
-            with open(file_path, 'wb') as f:
-                f.write(encrypted_data)
-            
+            self._rewrite_file(file_path, self._encrypt_stream)
             return True
             
         except Exception as e:
@@ -544,18 +1046,83 @@ class DataEncryption:
         """Decrypt a file in place."""
         try:
             with open(file_path, 'rb') as f:
-                encrypted_data = f.read()
+                magic = f.read(len(self.FILE_MAGIC))
             
-            decrypted_data = self.cipher.decrypt(encrypted_data)
-            
-            with open(file_path, 'wb') as f:
-                f.write(decrypted_data)
+            if magic == self.FILE_MAGIC:
+                self._rewrite_file(file_path, self._decrypt_stream)
+            else:
+                # Files encrypted before the switch to AES-GCM
+                self._rewrite_file(file_path,
+                                   lambda src, dst: dst.write(self.cipher.decrypt(src.read())))
             
             return True
             
         except Exception as e:
             logging.error(f"Error decrypting file {file_path}: {e}")
             return False
+    
+    def _rewrite_file(self, file_path: str, transform):
+        """Stream a file through transform into a temp file, then swap it in."""
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(file_path)))
+        try:
+            with open(file_path, 'rb') as src, os.fdopen(fd, 'wb') as dst:
+                transform(src, dst)
+            shutil.copymode(file_path, temp_path)
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
+    def _chunk_nonce(self, prefix: bytes, counter: int, last: bool) -> bytes:
+        """Build a chunk nonce: random prefix, chunk counter and final-chunk flag."""
+        return prefix + counter.to_bytes(4, 'big') + (b'\x01' if last else b'\x00')
+    
+    def _encrypt_stream(self, src, dst):
+        """Encrypt src into dst as length-prefixed AES-GCM chunks."""
+        prefix = os.urandom(self.NONCE_PREFIX_SIZE)
+        dst.write(self.FILE_MAGIC + prefix)
+        
+        counter = 0
+        chunk = src.read(self.CHUNK_SIZE)
+        while True:
+            next_chunk = src.read(self.CHUNK_SIZE)
+            last = not next_chunk
+            nonce = self._chunk_nonce(prefix, counter, last)
+            encrypted_chunk = self.file_cipher.encrypt(nonce, chunk, self.FILE_MAGIC)
+            dst.write(self.CHUNK_HEADER.pack(len(encrypted_chunk)))
+            dst.write(encrypted_chunk)
+            
+            if last:
+                break
+            chunk = next_chunk
+            counter += 1
+    
+    def _decrypt_stream(self, src, dst):
+        """Decrypt length-prefixed AES-GCM chunks from src into dst."""
+        src.read(len(self.FILE_MAGIC))
+        prefix = src.read(self.NONCE_PREFIX_SIZE)
+        
+        counter = 0
+        header = src.read(self.CHUNK_HEADER.size)
+        while True:
+            if len(header) != self.CHUNK_HEADER.size:
+                raise ValueError("Encrypted file is truncated")
+            (length,) = self.CHUNK_HEADER.unpack(header)
+            encrypted_chunk = src.read(length)
+            if len(encrypted_chunk) != length:
+                raise ValueError("Encrypted file is truncated")
+            
+            # The final-chunk flag is part of the nonce, so a file cut at a
+            # chunk boundary fails authentication instead of decrypting short.
+            header = src.read(self.CHUNK_HEADER.size)
+            last = not header
+            nonce = self._chunk_nonce(prefix, counter, last)
+            dst.write(self.file_cipher.decrypt(nonce, encrypted_chunk, self.FILE_MAGIC))
+            
+            if last:
+                break
+            counter += 1
 
 # Global instances
 rbac_manager = RBACManager()
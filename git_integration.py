@@ -6,24 +6,126 @@ Provides Git repository integration for version control and collaboration
 
 import os
 import subprocess
-import json
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import tempfile
 import shutil
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+# Optional in-process Git access; without it every query spawns a git process
+try:
+    import pygit2
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    PYGIT2_AVAILABLE = False
 
 class GitIntegration:
+    # Whether a git executable is on PATH, probed once per process
+    _git_available: Optional[bool] = None
+    # Open pygit2 repositories kept for reuse; older ones are freed beyond this
+    REPOSITORY_CACHE_SIZE = 32
+    
     def __init__(self):
         self.git_available = self._check_git_available()
+        # pygit2 repository handles, keyed by absolute project path, least
+        # recently used first
+        self._repositories = OrderedDict()
+        self._repositories_lock = threading.Lock()
     
     def _check_git_available(self) -> bool:
         """Check if Git is available on the system"""
+        if GitIntegration._git_available is None:
+            GitIntegration._git_available = shutil.which('git') is not None
+        return GitIntegration._git_available
+    
+    def _run_git(self, project_path: str, *args: str) -> subprocess.CompletedProcess:
+        """Run a read-only git command against project_path and capture its output"""
+        return subprocess.run(['git', '-C', project_path, *args],
+                              stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                              text=True, check=True)
+    
+    def _read_branches(self, project_path: str) -> Tuple[Optional[str], List[str], Optional[str]]:
+        """Get the current branch, all branches and the HEAD commit with a single git call"""
+        result = self._run_git(project_path, 'branch',
+                               '--format=%(HEAD)%00%(refname)%00%(refname:short)%00%(objectname)')
+        
+        current_branch = None
+        branches = []
+        head_commit = None
+        for line in result.stdout.splitlines():
+            if not line:
+                continue
+            head, refname, short_name, objectname = line.split('\0')
+            branches.append(short_name)
+            if head == '*':
+                # A detached HEAD is listed too, but it isn't a branch
+                current_branch = short_name if refname.startswith('refs/heads/') else ''
+                head_commit = objectname or None
+        
+        if current_branch is None:
+            # No commits yet, so the current branch has no ref to list
+            result = self._run_git(project_path, 'symbolic-ref', '--short', 'HEAD')
+            current_branch = result.stdout.strip()
+        
+        return current_branch, branches, head_commit
+    
+    def _open_repository(self, project_path: str):
+        """Get a cached pygit2 repository for project_path, or None to use the git CLI"""
+        if not PYGIT2_AVAILABLE:
+            return None
+        
+        key = os.path.abspath(project_path)
+        with self._repositories_lock:
+            repo = self._repositories.get(key)
+            if repo is not None:
+                self._repositories.move_to_end(key)
+                return repo
+        
         try:
-            result = subprocess.run(['git', '--version'], 
-                                  capture_output=True, text=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            return False
+            repo_path = pygit2.discover_repository(key)
+            if repo_path is None:
+                return None
+            repo = pygit2.Repository(repo_path)
+        except (pygit2.GitError, KeyError, ValueError):
+            return None
+        
+        with self._repositories_lock:
+            self._repositories[key] = repo
+            self._repositories.move_to_end(key)
+            # Dropped handles close once no caller is still using them
+            while len(self._repositories) > self.REPOSITORY_CACHE_SIZE:
+                self._repositories.popitem(last=False)
+        return repo
+    
+    def _repository_branch(self, repo) -> str:
+        """Current branch of a pygit2 repository; empty when HEAD is detached"""
+        if repo.head_is_detached:
+            return ''
+        # HEAD is symbolic, so this also works before the first commit
+        head_target = repo.references['HEAD'].target
+        return head_target[len('refs/heads/'):] if head_target.startswith('refs/heads/') else head_target
+    
+    def _repository_history(self, repo, limit: int) -> List[Dict]:
+        """Commit history of a pygit2 repository, newest first, in get_commit_history's format"""
+        if repo.head_is_unborn:
+            return []
+        
+        commits = []
+        for commit in repo.walk(repo.head.target, pygit2.GIT_SORT_TIME):
+            if len(commits) >= limit:
+                break
+            author = commit.author
+            date = datetime.fromtimestamp(author.time, timezone(timedelta(minutes=author.offset)))
+            commits.append({
+                'hash': str(commit.id),
+                'author': author.name,
+                # git's default date format, as produced by %ad
+                'date': f"{date:%a %b} {date.day} {date:%H:%M:%S %Y %z}",
+                'message': commit.message.strip().split('\n\n', 1)[0].replace('\n', ' ')
+            })
+        return commits
     
     def initialize_repository(self, project_path: str) -> bool:
         """Initialize a Git repository in the project directory"""
@@ -85,9 +187,15 @@ class GitIntegration:
         if not self.git_available:
             return None
         
+        repo = self._open_repository(project_path)
+        if repo is not None:
+            try:
+                return self._repository_branch(repo)
+            except pygit2.GitError:
+                pass
+        
         try:
-            result = subprocess.run(['git', 'branch', '--show-current'], 
-                                  cwd=project_path, capture_output=True, text=True, check=True)
+            result = self._run_git(project_path, 'branch', '--show-current')
             return result.stdout.strip()
         except subprocess.CalledProcessError:
             return None
@@ -97,16 +205,17 @@ class GitIntegration:
         if not self.git_available:
             return []
         
+        repo = self._open_repository(project_path)
+        # git lists a detached HEAD as a pseudo-branch, so leave that case to the CLI
+        if repo is not None and not repo.head_is_detached:
+            try:
+                return sorted(repo.branches.local)
+            except pygit2.GitError:
+                pass
+        
         try:
-            result = subprocess.run(['git', 'branch', '--list'], 
-                                  cwd=project_path, capture_output=True, text=True, check=True)
-            branches = []
-            for line in result.stdout.split('\n'):
-                if line.strip():
-                    # Remove the asterisk and spaces from current branch
-                    branch = line.strip().replace('* ', '')
-                    branches.append(branch)
-            return branches
+            result = self._run_git(project_path, 'branch', '--format=%(refname:short)')
+            return [line for line in result.stdout.splitlines() if line]
         except subprocess.CalledProcessError:
             return []
     
@@ -115,20 +224,25 @@ class GitIntegration:
         if not self.git_available:
             return []
         
+        repo = self._open_repository(project_path)
+        if repo is not None:
+            try:
+                return self._repository_history(repo, limit)
+            except pygit2.GitError:
+                pass
+        
         try:
-            result = subprocess.run([
-                'git', 'log', f'--max-count={limit}', 
-                '--pretty=format:{"hash":"%H","author":"%an","date":"%ad","message":"%s"}'
-            ], cwd=project_path, capture_output=True, text=True, check=True)
+            # Unit/record separators can't appear in these fields, unlike the
+            # quotes and backslashes that broke a JSON-shaped format
+            result = self._run_git(project_path, 'log', f'--max-count={limit}',
+                                   '--pretty=format:%H%x1f%an%x1f%ad%x1f%s%x1e')
             
             commits = []
-            for line in result.stdout.split('\n'):
-                if line.strip():
-                    try:
-                        commit_data = json.loads(line)
-                        commits.append(commit_data)
-                    except json.JSONDecodeError:
-                        continue
+            for record in result.stdout.split('\x1e'):
+                record = record.lstrip('\n')
+                if record:
+                    commit_hash, author, date, message = record.split('\x1f')
+                    commits.append({'hash': commit_hash, 'author': author, 'date': date, 'message': message})
             
             return commits
         except subprocess.CalledProcessError:
@@ -222,27 +336,34 @@ class GitIntegration:
         try:
             info = {'available': True}
             
-            # Get current branch
-            info['current_branch'] = self.get_current_branch(project_path)
+            repo = self._open_repository(project_path)
+            if repo is not None and not repo.head_is_detached:
+                try:
+                    info['current_branch'] = self._repository_branch(repo)
+                    info['branches'] = sorted(repo.branches.local)
+                    origin = next((remote for remote in repo.remotes if remote.name == 'origin'), None)
+                    info['remote_url'] = origin.url if origin is not None else None
+                    info['last_commit'] = None if repo.head_is_unborn else str(repo.head.target)
+                    return info
+                except pygit2.GitError:
+                    info = {'available': True}
             
-            # Get all branches
-            info['branches'] = self.get_branches(project_path)
+            # Get current branch, all branches and last commit in one call
+            try:
+                current_branch, branches, last_commit = self._read_branches(project_path)
+            except subprocess.CalledProcessError:
+                current_branch, branches, last_commit = None, [], None
+            info['current_branch'] = current_branch
+            info['branches'] = branches
             
             # Get remote URL
             try:
-                result = subprocess.run(['git', 'remote', 'get-url', 'origin'], 
-                                      cwd=project_path, capture_output=True, text=True, check=True)
+                result = self._run_git(project_path, 'remote', 'get-url', 'origin')
                 info['remote_url'] = result.stdout.strip()
             except subprocess.CalledProcessError:
                 info['remote_url'] = None
             
-            # Get last commit
-            try:
-                result = subprocess.run(['git', 'log', '-1', '--pretty=format:%H'], 
-                                      cwd=project_path, capture_output=True, text=True, check=True)
-                info['last_commit'] = result.stdout.strip()
-            except subprocess.CalledProcessError:
-                info['last_commit'] = None
+            info['last_commit'] = last_commit
             
             return info
         except Exception as e:
@@ -6,9 +6,7 @@ Simple launcher for Code Project Converter
 import os
 import sys
 import webbrowser
-import time
 import threading
-from pathlib import Path
 
 def main():
     """Launch the Code Project Converter"""
@@ -29,8 +27,10 @@ def main():
         'gemma3n_integration.py'
     ]
     
+    # One directory listing instead of a stat call per file
+    existing_files = {entry.name for entry in os.scandir('.')}
     for file in required_files:
-        if not Path(file).exists():
+        if file not in existing_files:
             print(f"❌ Missing required file: {file}")
             return
     
@@ -45,13 +45,9 @@ def main():
     print("   Press Ctrl+C to stop")
     
     # Open browser after delay
-    def open_browser():
-        time.sleep(2)
-        webbrowser.open('http://localhost:5000')
-    
-    browser_thread = threading.Thread(target=open_browser)
-    browser_thread.daemon = True
-    browser_thread.start()
+    browser_timer = threading.Timer(2.0, webbrowser.open, args=('http://localhost:5000',))
+    browser_timer.daemon = True
+    browser_timer.start()
     
     # Start the web interface
     try:
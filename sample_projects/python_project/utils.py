@@ -2,17 +2,22 @@
 Utility functions for mathematical operations
 """
 
+import math
+
 def factorial(n):
     """Calculate factorial of n"""
     if n <= 1:
         return 1
-    return n * factorial(n - 1)
+    return math.factorial(n)
 
 def fibonacci(n):
     """Calculate nth Fibonacci number"""
     if n <= 1:
         return n
-    return fibonacci(n - 1) + fibonacci(n - 2)
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
 
 def print_list(items):
     """Print all items in a list"""
@@ -24,15 +29,25 @@ def is_prime(n):
     """Check if a number is prime"""
     if n < 2:
         return False
-    for i in range(2, int(n ** 0.5) + 1):
+    if n % 2 == 0:
+        return n == 2
+    i = 3
+    while i * i <= n:
         if n % i == 0:
             return False
+        i += 2
     return True
 
 def get_primes_up_to(n):
-    """Get all prime numbers up to n"""
-    primes = []
-    for i in range(2, n + 1):
-        if is_prime(i):
-            primes.append(i)
-    return primes 
\ No newline at end of file
+    """Get all prime numbers up to n (Sieve of Eratosthenes)"""
+    if n < 2:
+        return []
+    sieve = [True] * (n + 1)
+    sieve[0] = sieve[1] = False
+    i = 2
+    while i * i <= n:
+        if sieve[i]:
+            for multiple in range(i * i, n + 1, i):
+                sieve[multiple] = False
+        i += 1
+    return [i for i in range(2, n + 1) if sieve[i]] 
\ No newline at end of file
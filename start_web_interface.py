@@ -5,9 +5,10 @@ Launcher for the Code Conversion Web Interface
 
 import os
 import sys
+import logging
+import importlib
 import subprocess
 import webbrowser
-import time
 from pathlib import Path
 
 def check_dependencies():
@@ -38,19 +39,71 @@ def create_sample_zip():
     sample_dir = Path("sample_projects/c_project")
     zip_path = Path("sample_c_project.zip")
     
-    if not zip_path.exists() and sample_dir.exists():
-        print("Creating sample project ZIP...")
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_path in sample_dir.rglob('*'):
-                if file_path.is_file():
-                    arcname = file_path.relative_to(sample_dir)
-                    zipf.write(file_path, arcname)
-        print(f"✅ Sample ZIP created: {zip_path}")
-        return str(zip_path)
-    return None
+    if not sample_dir.exists():
+        return None
+    
+    sample_files = [file_path for file_path in sample_dir.rglob('*') if file_path.is_file()]
+    
+    # Rebuild only when the ZIP is missing or older than a sample file
+    if zip_path.exists():
+        newest = max((file_path.stat().st_mtime for file_path in sample_files), default=0)
+        if zip_path.stat().st_mtime >= newest:
+            return None
+    
+    print("Creating sample project ZIP...")
+    # The sample is tiny, so storing beats spending CPU on deflate
+    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as zipf:
+        for file_path in sample_files:
+            arcname = file_path.relative_to(sample_dir)
+            zipf.write(file_path, arcname)
+    print(f"✅ Sample ZIP created: {zip_path}")
+    return str(zip_path)
+
+def serve_with_gunicorn(app, host='0.0.0.0', port=5000):
+    """Serve app with Gunicorn worker processes; False if Gunicorn isn't available"""
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        # Not installed, or on Windows where Gunicorn doesn't run
+        return False
+    
+    class LauncherApplication(BaseApplication):
+        """Gunicorn application wrapping the already imported Flask app"""
+        
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+        
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            return self.application
+    
+    options = {
+        'bind': f'{host}:{port}',
+        # One worker by default: the audit log is the only module-level state
+        # that is safe to share, while RBAC, team data and the lazily loaded
+        # AI model are per process. Concurrency comes from the threads
+        'workers': int(os.environ.get('WEB_CONCURRENCY', 1)),
+        'worker_class': 'gthread',
+        'threads': int(os.environ.get('WEB_THREADS', 8)),
+        # Workers fork from the loaded app and share its pages copy-on-write
+        'preload_app': True,
+        # AI conversions of a whole project can run well past the 30s default
+        'timeout': 600,
+    }
+    LauncherApplication(app, options).run()
+    return True
 
 def main():
     """Main launcher function"""
+    # Library modules log through `logging`; show warnings and up unless
+    # LOGLEVEL asks for more
+    logging.basicConfig(level=os.environ.get('LOGLEVEL', 'WARNING').upper())
+    
     print("🚀 Code Conversion Web Interface Launcher")
     print("=" * 50)
     
@@ -62,6 +115,21 @@ def main():
             print("   pip install -r requirements_web.txt")
             return
     
+    # Import the web app (which pulls in the converter and AI modules) in the
+    # background while the sample ZIP is written
+    import threading
+    web_module = {}
+    
+    def import_web_interface():
+        try:
+            web_module['module'] = importlib.import_module('web_interface')
+        except Exception as e:
+            web_module['error'] = e
+    
+    import_thread = threading.Thread(target=import_web_interface)
+    import_thread.daemon = True
+    import_thread.start()
+    
     # Create sample ZIP
     sample_zip = create_sample_zip()
     
@@ -75,19 +143,20 @@ def main():
         print("   You can use this ZIP file to test the conversion")
     
     # Open browser after a short delay
-    def open_browser():
-        time.sleep(2)
-        webbrowser.open('http://localhost:5000')
-    
-    import threading
-    browser_thread = threading.Thread(target=open_browser)
-    browser_thread.daemon = True
-    browser_thread.start()
+    browser_timer = threading.Timer(2.0, webbrowser.open, args=('http://localhost:5000',))
+    browser_timer.daemon = True
+    browser_timer.start()
     
-    # Start Flask app
+    # Start Flask app. The debugger and reloader are opt-in: the reloader runs
+    # the whole launcher a second time in a child process
+    debug = os.environ.get('FLASK_DEBUG') == '1'
     try:
-        from web_interface import app
-        app.run(debug=True, host='0.0.0.0', port=5000)
+        import_thread.join()
+        if 'error' in web_module:
+            raise web_module['error']
+        app = web_module['module'].app
+        if debug or not serve_with_gunicorn(app):
+            app.run(debug=debug, host='0.0.0.0', port=5000, threaded=True)
     except KeyboardInterrupt:
         print("\n👋 Web interface stopped")
     except Exception as e:
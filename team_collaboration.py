@@ -5,12 +5,40 @@ Provides basic team features like project sharing, comments, and approval workfl
 """
 
 import json
+import logging
 import uuid
-from datetime import datetime
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Iterable
+import dataclasses
+from dataclasses import dataclass
 from enum import Enum
 import os
+import sys
+import atexit
+import functools
+import heapq
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON, with orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+def _json_loads(data: bytes) -> Any:
+    """Parse UTF-8 JSON, with orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
 
 class UserRole(Enum):
     VIEWER = "viewer"
@@ -23,7 +51,14 @@ class CommentStatus(Enum):
     RESOLVED = "resolved"
     REJECTED = "rejected"
 
-@dataclass
+# Stored value -> enum member, a plain dict lookup instead of Enum.__call__
+_ROLE_BY_VALUE = {role.value: role for role in UserRole}
+_COMMENT_STATUS_BY_VALUE = {status.value: status for status in CommentStatus}
+
+# Slotted dataclasses drop the per-instance __dict__; slots=True needs 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_OPTIONS)
 class User:
     id: str
     username: str
@@ -32,7 +67,7 @@ class User:
     created_at: datetime
     last_active: datetime
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Project:
     id: str
     name: str
@@ -46,7 +81,7 @@ class Project:
     status: str  # 'converting', 'completed', 'reviewing', 'approved'
     shared_with: List[str]  # user IDs
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Comment:
     id: str
     project_id: str
@@ -59,7 +94,7 @@ class Comment:
     resolved_at: Optional[datetime]
     resolved_by: Optional[str]
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ApprovalRequest:
     id: str
     project_id: str
@@ -70,9 +105,131 @@ class ApprovalRequest:
     resolved_at: Optional[datetime]
     comments: str
 
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
+class _Indexes:
+    """Lookup indexes used by the get_* list methods, replaced as a whole"""
+    # project_id -> comment IDs, approver_id -> approval IDs and
+    # user_id -> IDs of projects shared with them, in insertion order
+    comments_by_project: Dict[str, List[str]]
+    approvals_by_approver: Dict[str, List[str]]
+    projects_by_user: Dict[str, List[str]]
+    # project_id -> set of its shared_with list, for O(1) membership tests
+    shared_sets: Dict[str, set]
+    # Record ID -> the timestamp its list is ordered by, as an int, so
+    # sorting compares ints and can use dict.__getitem__ as the key
+    comment_created_us: Dict[str, int]
+    approval_created_us: Dict[str, int]
+    project_updated_us: Dict[str, int]
+
+@functools.lru_cache(maxsize=8192)
+def _parse_iso(value: str) -> datetime:
+    """Parse a stored ISO timestamp; repeated values come from the cache"""
+    return datetime.fromisoformat(value)
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+def _timestamp_us(value: str) -> int:
+    """Microseconds since the epoch for a stored (naive) ISO timestamp, as a sort key"""
+    return (_parse_iso(value).replace(tzinfo=None) - _EPOCH) // _MICROSECOND
+
+# Builders for the get_* results. Each is generated once per dataclass with
+# the field names and converters written straight into its code, so building
+# a result sets the fields on a bare instance with no per-field lookups or
+# dataclass __init__ keyword handling.
+
+def _make_builder(cls: type, converters: Dict[str, Any], optional: tuple = ()):
+    """Generate a function that builds a cls instance from its stored record
+    
+    Fields named in converters are passed through that callable; fields in
+    optional may be missing from older records and default to None (their
+    converter is skipped for empty values).
+    """
+    namespace = {'_new': object.__new__, '_cls': cls}
+    lines = [f"def _from_record(d):",
+             f"    o = _new(_cls)"]
+    for field in dataclasses.fields(cls):
+        name = field.name
+        value = f"d.get({name!r})" if name in optional else f"d[{name!r}]"
+        converter = converters.get(name)
+        if converter is None:
+            lines.append(f"    o.{name} = {value}")
+        else:
+            namespace[f"_convert_{name}"] = converter
+            if name in optional:
+                lines.append(f"    v = {value}")
+                lines.append(f"    o.{name} = _convert_{name}(v) if v else None")
+            else:
+                lines.append(f"    o.{name} = _convert_{name}({value})")
+    lines.append("    return o")
+    
+    exec('\n'.join(lines), namespace)
+    builder = namespace['_from_record']
+    builder.__name__ = builder.__qualname__ = f"_{cls.__name__.lower()}_from_record"
+    builder.__doc__ = f"Build a {cls.__name__} from its stored record"
+    return builder
+
+_user_from_record = _make_builder(User, {
+    'role': _ROLE_BY_VALUE.__getitem__,
+    'created_at': _parse_iso,
+    'last_active': _parse_iso,
+})
+_project_from_record = _make_builder(Project, {
+    'created_at': _parse_iso,
+    'updated_at': _parse_iso,
+})
+_comment_from_record = _make_builder(Comment, {
+    'status': _COMMENT_STATUS_BY_VALUE.__getitem__,
+    'created_at': _parse_iso,
+    'resolved_at': _parse_iso,
+}, optional=('line_number', 'resolved_at', 'resolved_by'))
+_approval_from_record = _make_builder(ApprovalRequest, {
+    'created_at': _parse_iso,
+    'resolved_at': _parse_iso,
+}, optional=('resolved_at',))
+
 class TeamCollaboration:
-    def __init__(self, data_dir: str = "team_data"):
+    """Team users, projects, comments and approvals, persisted as JSON files.
+    
+    Each data set lives in a JSON snapshot file. Mutations only append the
+    changed records to a journal next to it (users.json.journal, ...), which
+    is replayed on load and folded back into the snapshot once it holds
+    compact_threshold entries, so a change costs a write proportional to the
+    record rather than to the whole data set.
+    
+    Journal appends are coalesced: mutations queue the changed record and a
+    timer writes everything queued within flush_delay seconds in one append
+    per data set. Call flush() to persist immediately; it also runs at
+    interpreter exit.
+    
+    The instance is shared by all requests: mutations and flushes hold a
+    write lock, while the get_* methods read without locking.
+    """
+    
+    # Data set name -> (timestamp fields, enum field, enum class, interned
+    # fields), the _normalize_records arguments for its records
+    _RECORD_FORMATS = {
+        'users': (('created_at', 'last_active'), 'role', UserRole, ('role',)),
+        'projects': (('created_at', 'updated_at'), None, None,
+                     ('status', 'conversion_type', 'source_language', 'target_language')),
+        'comments': (('created_at', 'resolved_at'), 'status', CommentStatus, ('status',)),
+        'approvals': (('created_at', 'resolved_at'), None, None, ('status',)),
+    }
+    
+    # Data set name -> builder of its get_* results, which also checks that a
+    # record has every required field in a usable form
+    _RECORD_BUILDERS = {
+        'users': _user_from_record,
+        'projects': _project_from_record,
+        'comments': _comment_from_record,
+        'approvals': _approval_from_record,
+    }
+    
+    def __init__(self, data_dir: str = "team_data", flush_delay: float = 0.2,
+                 compact_threshold: int = 1000):
         self.data_dir = data_dir
+        self.flush_delay = flush_delay
+        self.compact_threshold = compact_threshold
         os.makedirs(data_dir, exist_ok=True)
         
         # Initialize data files
@@ -82,256 +239,491 @@ class TeamCollaboration:
         self.approvals_file = os.path.join(data_dir, "approvals.json")
         
         # Load existing data
-        self.users = self._load_data(self.users_file, {})
-        self.projects = self._load_data(self.projects_file, {})
-        self.comments = self._load_data(self.comments_file, {})
-        self.approvals = self._load_data(self.approvals_file, {})
+        self._journal_entries: Dict[str, int] = {}
+        # The four data sets are loaded concurrently so their file reads overlap
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            self.users, self.projects, self.comments, self.approvals = executor.map(
+                self._load_data_set, ('users', 'projects', 'comments', 'approvals'))
+        
+        for name, record_format in self._RECORD_FORMATS.items():
+            self._normalize_records(getattr(self, name), *record_format)
+        
+        self._build_indexes()
+        
+        # Data set name -> IDs of records changed since the last flush
+        self._pending: Dict[str, Dict[str, None]] = {}
+        # Serializes mutations and flushes. Readers take no lock: writers
+        # never change a stored record in place but swap in an updated copy,
+        # so a get_* call sees each record either before or after a change.
+        self._write_lock = threading.RLock()
+        # Data set name -> record ID -> the record's JSON encoding, dropped
+        # whenever the record changes, so compacting only encodes the records
+        # changed since they were last written
+        self._encoded_records: Dict[str, Dict[str, bytes]] = {name: {} for name in self._RECORD_FORMATS}
+        self._flush_timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
+    
+    def _build_indexes(self):
+        """Build the lookup indexes used by the get_* list methods"""
+        comments_by_project: Dict[str, List[str]] = {}
+        approvals_by_approver: Dict[str, List[str]] = {}
+        projects_by_user: Dict[str, List[str]] = {}
+        shared_sets: Dict[str, set] = {}
+        comment_created_us: Dict[str, int] = {}
+        approval_created_us: Dict[str, int] = {}
+        project_updated_us: Dict[str, int] = {}
+        
+        for comment_id, comment_data in self.comments.items():
+            comment_created_us[comment_id] = _timestamp_us(comment_data['created_at'])
+            comments_by_project.setdefault(comment_data['project_id'], []).append(comment_id)
+        for approval_id, approval_data in self.approvals.items():
+            approval_created_us[approval_id] = _timestamp_us(approval_data['created_at'])
+            approvals_by_approver.setdefault(approval_data['approver_id'], []).append(approval_id)
+        for project_id, project_data in self.projects.items():
+            project_updated_us[project_id] = _timestamp_us(project_data['updated_at'])
+            shared_sets[project_id] = set(project_data['shared_with'])
+            for user_id in shared_sets[project_id]:
+                projects_by_user.setdefault(user_id, []).append(project_id)
+        
+        # Swapped in with a single assignment once complete; lock-free readers
+        # take self._indexes once, so they never mix old and new indexes
+        self._indexes = _Indexes(
+            comments_by_project, approvals_by_approver, projects_by_user, shared_sets,
+            comment_created_us, approval_created_us, project_updated_us)
+    
+    def _normalize_records(self, records: Dict[str, Dict], timestamp_fields: tuple,
+                           enum_field: Optional[str] = None, enum_cls: Optional[type] = None,
+                           interned_fields: tuple = ()):
+        """Convert values written by str() in older data files to the stored format
+        
+        Timestamps must all use the ISO 'T' separator so that comparing the
+        strings orders them by time. The short, heavily repeated strings in
+        interned_fields are interned so every record shares one copy.
+        """
+        for record in records.values():
+            for field in timestamp_fields:
+                value = record.get(field)
+                if value and value[10:11] == ' ':
+                    record[field] = value[:10] + 'T' + value[11:]
+            if enum_field:
+                value = record.get(enum_field)
+                prefix = enum_cls.__name__ + '.'
+                if value and value.startswith(prefix):
+                    record[enum_field] = enum_cls[value[len(prefix):]].value
+            for field in interned_fields:
+                value = record.get(field)
+                if isinstance(value, str):
+                    record[field] = sys.intern(value)
     
     def _load_data(self, file_path: str, default: Any) -> Any:
         """Load data from JSON file"""
         try:
             if os.path.exists(file_path):
-                with open(file_path, 'r') as f:
-                    return json.load(f)
+                with open(file_path, 'rb') as f:
+                    return _json_loads(f.read())
         except Exception as e:
-            print(f"Warning: Could not load {file_path}: {e}")
+            logger.warning("Could not load %s: %s", file_path, e)
         return default
     
-    def _save_data(self, file_path: str, data: Any):
-        """Save data to JSON file"""
+    def _load_data_set(self, name: str) -> Dict[str, Dict]:
+        """Load a data set's snapshot and apply the records journaled since"""
+        file_path = getattr(self, f"{name}_file")
+        records = self._load_data(file_path, {})
+        
+        entries = 0
+        journal_path = file_path + '.journal'
         try:
-            with open(file_path, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            if os.path.exists(journal_path):
+                with open(journal_path, 'rb+') as f:
+                    line_start = 0
+                    for line in f:
+                        try:
+                            entry = _json_loads(line)
+                            records[entry['id']] = entry['record']
+                            entries += 1
+                        except (json.JSONDecodeError, KeyError, TypeError):
+                            if line.endswith(b'\n'):
+                                # A damaged line between good ones; the
+                                # entries after it are still valid
+                                logger.warning("Skipping a bad line in %s", journal_path)
+                            else:
+                                # A torn final line from an interrupted append;
+                                # cut it off so the next append starts cleanly
+                                f.truncate(line_start)
+                                break
+                        else:
+                            if not line.endswith(b'\n'):
+                                # Complete but unterminated: end it so the next
+                                # append starts on its own line
+                                f.write(b'\n')
+                        line_start += len(line)
         except Exception as e:
-            print(f"Error saving {file_path}: {e}")
+            logger.warning("Could not load %s: %s", journal_path, e)
+        
+        self._journal_entries[name] = entries
+        return records
     
-    def create_user(self, username: str, email: str, role: UserRole = UserRole.VIEWER) -> str:
-        """Create a new user"""
-        user_id = str(uuid.uuid4())
-        now = datetime.now()
+    def _save_data(self, file_path: str, data: Any) -> bool:
+        """Save data, or its already encoded JSON bytes, to JSON file
         
-        user = User(
-            id=user_id,
-            username=username,
-            email=email,
-            role=role,
-            created_at=now,
-            last_active=now
-        )
+        The data is encoded up front and written in one call to a temp file,
+        which is swapped in with os.replace so a crash never leaves a
+        partially written file behind. The temp name is unique per process
+        and thread, so instances sharing a data directory don't collide.
+        """
+        try:
+            temp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(data if isinstance(data, bytes) else _json_dumps(data))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, file_path)
+            return True
+        except Exception:
+            logger.exception("Error saving %s", file_path)
+            return False
+    
+    def _mark_dirty(self, name: str, record_id: str):
+        """Queue a changed record of the named data set for the next flush"""
+        with self._write_lock:
+            self._encoded_records[name].pop(record_id, None)
+            self._pending.setdefault(name, {})[record_id] = None
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def flush(self):
+        """Append the records changed since the last flush to their journals"""
+        with self._write_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            
+            # Records whose append failed stay queued for the next flush
+            failed: Dict[str, Dict[str, None]] = {}
+            for name, record_ids in self._pending.items():
+                file_path = getattr(self, f"{name}_file")
+                journal_path = file_path + '.journal'
+                try:
+                    with open(journal_path, 'ab', buffering=0) as f:
+                        journal_end = os.fstat(f.fileno()).st_size
+                        try:
+                            # Serialized now, so a record changed several times since
+                            # the last flush is written once, in its latest state
+                            data = memoryview(b''.join(
+                                b'{"id":' + _json_dumps(record_id) + b',"record":'
+                                + self._encode_record(name, record_id) + b'}\n'
+                                for record_id in record_ids
+                            ))
+                            while data:
+                                data = data[f.write(data):]
+                        except Exception:
+                            # Drop any partial append, so later appends don't
+                            # continue a torn line
+                            os.ftruncate(f.fileno(), journal_end)
+                            raise
+                except Exception:
+                    logger.exception("Error saving %s", journal_path)
+                    failed[name] = record_ids
+                    continue
+                
+                self._journal_entries[name] += len(record_ids)
+                if self._journal_entries[name] >= self.compact_threshold:
+                    self._compact(name)
+            self._pending = failed
+            if failed:
+                self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def _encode_record(self, name: str, record_id: str) -> bytes:
+        """JSON encoding of a record of the named data set, cached until it changes"""
+        encoded = self._encoded_records[name]
+        data = encoded.get(record_id)
+        if data is None:
+            data = encoded[record_id] = _json_dumps(getattr(self, name)[record_id])
+        return data
+    
+    def _compact(self, name: str) -> bool:
+        """Fold a data set's journal into a fresh snapshot"""
+        file_path = getattr(self, f"{name}_file")
+        # Same bytes as encoding the whole dict, but unchanged records reuse
+        # their cached encoding
+        data = b'{' + b','.join(
+            _json_dumps(record_id) + b':' + self._encode_record(name, record_id)
+            for record_id in getattr(self, name)
+        ) + b'}'
+        if not self._save_data(file_path, data):
+            return False
+        journal_path = file_path + '.journal'
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
+        self._journal_entries[name] = 0
+        return True
+    
+    def bulk_import(self, users: Iterable[Dict] = (), projects: Iterable[Dict] = (),
+                    comments: Iterable[Dict] = (), approvals: Iterable[Dict] = ()) -> int:
+        """Import stored-format records in bulk, replacing any with the same ID
         
-        self.users[user_id] = asdict(user)
-        self._save_data(self.users_file, self.users)
-        return user_id
+        Each data set is updated in one step and written out as a single
+        snapshot, instead of one create_* call and journal entry per record.
+        Returns the number of records imported.
+        """
+        # Check every record before anything is merged or written, so a bad
+        # one can't reach a snapshot that every later load would fail on
+        imports = {}
+        for name, records in (('users', users), ('projects', projects),
+                              ('comments', comments), ('approvals', approvals)):
+            new_records = {}
+            for record in records:
+                if not isinstance(record, dict) or 'id' not in record:
+                    raise ValueError(f"Invalid {name} record: missing 'id'")
+                new_records[record['id']] = dict(record)
+            self._normalize_records(new_records, *self._RECORD_FORMATS[name])
+            for record_id, record in new_records.items():
+                self._validate_record(name, record_id, record)
+            imports[name] = new_records
+        
+        imported = 0
+        with self._write_lock:
+            for name, new_records in imports.items():
+                if not new_records:
+                    continue
+                
+                getattr(self, name).update(new_records)
+                encoded = self._encoded_records[name]
+                for record_id in new_records:
+                    encoded.pop(record_id, None)
+                if self._compact(name):
+                    # The snapshot holds every pending change to this data set
+                    self._pending.pop(name, None)
+                else:
+                    # Fall back to journaling the records on the next flush
+                    for record_id in new_records:
+                        self._mark_dirty(name, record_id)
+                imported += len(new_records)
+            
+            if imported:
+                self._build_indexes()
+        return imported
+    
+    def _validate_record(self, name: str, record_id: str, record: Dict):
+        """Raise ValueError unless a stored-format record can be loaded and indexed"""
+        try:
+            self._RECORD_BUILDERS[name](record)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid {name} record {record_id!r}: {e!r}") from None
+        if name == 'projects' and not isinstance(record['shared_with'], list):
+            raise ValueError(f"Invalid projects record {record_id!r}: shared_with must be a list")
+    
+    def create_user(self, username: str, email: str, role: UserRole = UserRole.VIEWER) -> str:
+        """Create a new user"""
+        with self._write_lock:
+            user_id = uuid.uuid4().hex
+            now = datetime.now().isoformat()
+            
+            # Records are stored as JSON-ready dicts: enums by value, datetimes as
+            # ISO strings. The dataclasses are only built for get_* results.
+            self.users[user_id] = {
+                'id': user_id,
+                'username': username,
+                'email': email,
+                'role': role.value,
+                'created_at': now,
+                'last_active': now
+            }
+            self._mark_dirty('users', user_id)
+            return user_id
     
     def get_user(self, user_id: str) -> Optional[User]:
         """Get user by ID"""
-        if user_id in self.users:
-            user_data = self.users[user_id]
-            return User(
-                id=user_data['id'],
-                username=user_data['username'],
-                email=user_data['email'],
-                role=UserRole(user_data['role']),
-                created_at=datetime.fromisoformat(user_data['created_at']),
-                last_active=datetime.fromisoformat(user_data['last_active'])
-            )
-        return None
+        user_data = self.users.get(user_id)
+        return _user_from_record(user_data) if user_data is not None else None
     
     def create_project(self, name: str, description: str, owner_id: str, 
                       conversion_type: str, source_lang: str, target_lang: str) -> str:
         """Create a new project"""
-        project_id = str(uuid.uuid4())
-        now = datetime.now()
-        
-        project = Project(
-            id=project_id,
-            name=name,
-            description=description,
-            owner_id=owner_id,
-            created_at=now,
-            updated_at=now,
-            conversion_type=conversion_type,
-            source_language=source_lang,
-            target_language=target_lang,
-            status='converting',
-            shared_with=[owner_id]
-        )
-        
-        self.projects[project_id] = asdict(project)
-        self._save_data(self.projects_file, self.projects)
-        return project_id
+        with self._write_lock:
+            project_id = uuid.uuid4().hex
+            now = datetime.now().isoformat()
+            
+            self.projects[project_id] = {
+                'id': project_id,
+                'name': name,
+                'description': description,
+                'owner_id': owner_id,
+                'created_at': now,
+                'updated_at': now,
+                'conversion_type': sys.intern(conversion_type),
+                'source_language': sys.intern(source_lang),
+                'target_language': sys.intern(target_lang),
+                'status': 'converting',
+                'shared_with': [owner_id]
+            }
+            self._indexes.shared_sets[project_id] = {owner_id}
+            self._indexes.project_updated_us[project_id] = _timestamp_us(now)
+            self._indexes.projects_by_user.setdefault(owner_id, []).append(project_id)
+            self._mark_dirty('projects', project_id)
+            return project_id
     
     def get_project(self, project_id: str) -> Optional[Project]:
         """Get project by ID"""
-        if project_id in self.projects:
-            project_data = self.projects[project_id]
-            return Project(
-                id=project_data['id'],
-                name=project_data['name'],
-                description=project_data['description'],
-                owner_id=project_data['owner_id'],
-                created_at=datetime.fromisoformat(project_data['created_at']),
-                updated_at=datetime.fromisoformat(project_data['updated_at']),
-                conversion_type=project_data['conversion_type'],
-                source_language=project_data['source_language'],
-                target_language=project_data['target_language'],
-                status=project_data['status'],
-                shared_with=project_data['shared_with']
-            )
-        return None
+        project_data = self.projects.get(project_id)
+        return _project_from_record(project_data) if project_data is not None else None
     
     def share_project(self, project_id: str, user_id: str, role: UserRole = UserRole.VIEWER) -> bool:
         """Share a project with a user"""
-        if project_id not in self.projects:
-            return False
-        
-        project_data = self.projects[project_id]
-        if user_id not in project_data['shared_with']:
-            project_data['shared_with'].append(user_id)
-            project_data['updated_at'] = datetime.now().isoformat()
-            self._save_data(self.projects_file, self.projects)
-        
-        return True
+        with self._write_lock:
+            if project_id not in self.projects:
+                return False
+            
+            project_data = self.projects[project_id]
+            shared_set = self._indexes.shared_sets[project_id]
+            if user_id not in shared_set:
+                shared_set.add(user_id)
+                now = datetime.now().isoformat()
+                self.projects[project_id] = {
+                    **project_data,
+                    'shared_with': project_data['shared_with'] + [user_id],
+                    'updated_at': now
+                }
+                self._indexes.project_updated_us[project_id] = _timestamp_us(now)
+                self._indexes.projects_by_user.setdefault(user_id, []).append(project_id)
+                self._mark_dirty('projects', project_id)
+            
+            return True
     
     def add_comment(self, project_id: str, user_id: str, file_path: str, 
                    content: str, line_number: Optional[int] = None) -> str:
         """Add a comment to a project"""
-        comment_id = str(uuid.uuid4())
-        now = datetime.now()
-        
-        comment = Comment(
-            id=comment_id,
-            project_id=project_id,
-            user_id=user_id,
-            file_path=file_path,
-            line_number=line_number,
-            content=content,
-            status=CommentStatus.PENDING,
-            created_at=now,
-            resolved_at=None,
-            resolved_by=None
-        )
-        
-        self.comments[comment_id] = asdict(comment)
-        self._save_data(self.comments_file, self.comments)
-        return comment_id
+        with self._write_lock:
+            comment_id = uuid.uuid4().hex
+            now = datetime.now().isoformat()
+            
+            self.comments[comment_id] = {
+                'id': comment_id,
+                'project_id': project_id,
+                'user_id': user_id,
+                'file_path': file_path,
+                'line_number': line_number,
+                'content': content,
+                'status': CommentStatus.PENDING.value,
+                'created_at': now,
+                'resolved_at': None,
+                'resolved_by': None
+            }
+            self._indexes.comment_created_us[comment_id] = _timestamp_us(now)
+            self._indexes.comments_by_project.setdefault(project_id, []).append(comment_id)
+            self._mark_dirty('comments', comment_id)
+            return comment_id
     
-    def get_project_comments(self, project_id: str) -> List[Comment]:
-        """Get all comments for a project"""
-        comments = []
-        for comment_data in self.comments.values():
-            if comment_data['project_id'] == project_id:
-                comment = Comment(
-                    id=comment_data['id'],
-                    project_id=comment_data['project_id'],
-                    user_id=comment_data['user_id'],
-                    file_path=comment_data['file_path'],
-                    line_number=comment_data.get('line_number'),
-                    content=comment_data['content'],
-                    status=CommentStatus(comment_data['status']),
-                    created_at=datetime.fromisoformat(comment_data['created_at']),
-                    resolved_at=datetime.fromisoformat(comment_data['resolved_at']) if comment_data.get('resolved_at') else None,
-                    resolved_by=comment_data.get('resolved_by')
-                )
-                comments.append(comment)
+    def get_project_comments(self, project_id: str, limit: Optional[int] = None) -> List[Comment]:
+        """Get all comments for a project, or only the first limit of them"""
+        # Order the IDs by their int sort keys and only build the records returned
+        comments = self.comments
+        indexes = self._indexes
+        comment_ids = indexes.comments_by_project.get(project_id, ())
+        sort_key = indexes.comment_created_us.__getitem__
+        if limit is None:
+            comment_ids = sorted(comment_ids, key=sort_key)
+        else:
+            comment_ids = heapq.nsmallest(limit, comment_ids, key=sort_key)
         
-        return sorted(comments, key=lambda x: x.created_at)
+        return [_comment_from_record(comments[comment_id]) for comment_id in comment_ids]
     
     def resolve_comment(self, comment_id: str, user_id: str, status: CommentStatus) -> bool:
         """Resolve a comment"""
-        if comment_id not in self.comments:
-            return False
-        
-        comment_data = self.comments[comment_id]
-        comment_data['status'] = status.value
-        comment_data['resolved_at'] = datetime.now().isoformat()
-        comment_data['resolved_by'] = user_id
-        
-        self._save_data(self.comments_file, self.comments)
-        return True
+        with self._write_lock:
+            if comment_id not in self.comments:
+                return False
+            
+            self.comments[comment_id] = {
+                **self.comments[comment_id],
+                'status': status.value,
+                'resolved_at': datetime.now().isoformat(),
+                'resolved_by': user_id
+            }
+            
+            self._mark_dirty('comments', comment_id)
+            return True
     
     def create_approval_request(self, project_id: str, requester_id: str, 
                               approver_id: str, comments: str = "") -> str:
         """Create an approval request"""
-        approval_id = str(uuid.uuid4())
-        now = datetime.now()
-        
-        approval = ApprovalRequest(
-            id=approval_id,
-            project_id=project_id,
-            requester_id=requester_id,
-            approver_id=approver_id,
-            status='pending',
-            created_at=now,
-            resolved_at=None,
-            comments=comments
-        )
-        
-        self.approvals[approval_id] = asdict(approval)
-        self._save_data(self.approvals_file, self.approvals)
-        return approval_id
+        with self._write_lock:
+            approval_id = uuid.uuid4().hex
+            now = datetime.now().isoformat()
+            
+            self.approvals[approval_id] = {
+                'id': approval_id,
+                'project_id': project_id,
+                'requester_id': requester_id,
+                'approver_id': approver_id,
+                'status': 'pending',
+                'created_at': now,
+                'resolved_at': None,
+                'comments': comments
+            }
+            self._indexes.approval_created_us[approval_id] = _timestamp_us(now)
+            self._indexes.approvals_by_approver.setdefault(approver_id, []).append(approval_id)
+            self._mark_dirty('approvals', approval_id)
+            return approval_id
     
     def approve_project(self, approval_id: str, approved: bool, comments: str = "") -> bool:
         """Approve or reject a project"""
-        if approval_id not in self.approvals:
-            return False
-        
-        approval_data = self.approvals[approval_id]
-        approval_data['status'] = 'approved' if approved else 'rejected'
-        approval_data['resolved_at'] = datetime.now().isoformat()
-        approval_data['comments'] = comments
-        
-        # Update project status
-        project_id = approval_data['project_id']
-        if project_id in self.projects:
-            self.projects[project_id]['status'] = 'approved' if approved else 'rejected'
-            self.projects[project_id]['updated_at'] = datetime.now().isoformat()
-            self._save_data(self.projects_file, self.projects)
-        
-        self._save_data(self.approvals_file, self.approvals)
-        return True
+        with self._write_lock:
+            if approval_id not in self.approvals:
+                return False
+            
+            approval_data = self.approvals[approval_id] = {
+                **self.approvals[approval_id],
+                'status': 'approved' if approved else 'rejected',
+                'resolved_at': datetime.now().isoformat(),
+                'comments': comments
+            }
+            
+            # Update project status
+            project_id = approval_data['project_id']
+            if project_id in self.projects:
+                now = datetime.now().isoformat()
+                self.projects[project_id] = {
+                    **self.projects[project_id],
+                    'status': 'approved' if approved else 'rejected',
+                    'updated_at': now
+                }
+                self._indexes.project_updated_us[project_id] = _timestamp_us(now)
+                self._mark_dirty('projects', project_id)
+            
+            self._mark_dirty('approvals', approval_id)
+            return True
     
-    def get_user_projects(self, user_id: str) -> List[Project]:
-        """Get all projects accessible to a user"""
-        projects = []
-        for project_data in self.projects.values():
-            if user_id in project_data['shared_with']:
-                project = Project(
-                    id=project_data['id'],
-                    name=project_data['name'],
-                    description=project_data['description'],
-                    owner_id=project_data['owner_id'],
-                    created_at=datetime.fromisoformat(project_data['created_at']),
-                    updated_at=datetime.fromisoformat(project_data['updated_at']),
-                    conversion_type=project_data['conversion_type'],
-                    source_language=project_data['source_language'],
-                    target_language=project_data['target_language'],
-                    status=project_data['status'],
-                    shared_with=project_data['shared_with']
-                )
-                projects.append(project)
+    def get_user_projects(self, user_id: str, limit: Optional[int] = None) -> List[Project]:
+        """Get all projects accessible to a user, or only the limit most recently updated"""
+        projects = self.projects
+        indexes = self._indexes
+        project_ids = indexes.projects_by_user.get(user_id, ())
+        sort_key = indexes.project_updated_us.__getitem__
+        if limit is None:
+            project_ids = sorted(project_ids, key=sort_key, reverse=True)
+        else:
+            project_ids = heapq.nlargest(limit, project_ids, key=sort_key)
         
-        return sorted(projects, key=lambda x: x.updated_at, reverse=True)
+        return [_project_from_record(projects[project_id]) for project_id in project_ids]
     
-    def get_pending_approvals(self, user_id: str) -> List[ApprovalRequest]:
-        """Get pending approval requests for a user"""
-        approvals = []
-        for approval_data in self.approvals.values():
-            if (approval_data['approver_id'] == user_id and 
-                approval_data['status'] == 'pending'):
-                approval = ApprovalRequest(
-                    id=approval_data['id'],
-                    project_id=approval_data['project_id'],
-                    requester_id=approval_data['requester_id'],
-                    approver_id=approval_data['approver_id'],
-                    status=approval_data['status'],
-                    created_at=datetime.fromisoformat(approval_data['created_at']),
-                    resolved_at=datetime.fromisoformat(approval_data['resolved_at']) if approval_data.get('resolved_at') else None,
-                    comments=approval_data['comments']
-                )
-                approvals.append(approval)
+    def get_pending_approvals(self, user_id: str, limit: Optional[int] = None) -> List[ApprovalRequest]:
+        """Get pending approval requests for a user, or only the limit newest"""
+        approvals = self.approvals
+        indexes = self._indexes
+        approval_ids = [approval_id for approval_id in indexes.approvals_by_approver.get(user_id, ())
+                        if approvals[approval_id]['status'] == 'pending']
+        sort_key = indexes.approval_created_us.__getitem__
+        if limit is None:
+            approval_ids.sort(key=sort_key, reverse=True)
+        else:
+            approval_ids = heapq.nlargest(limit, approval_ids, key=sort_key)
         
-        return sorted(approvals, key=lambda x: x.created_at, reverse=True)
+        return [_approval_from_record(approvals[approval_id]) for approval_id in approval_ids]
 
 # Global team collaboration instance
 team_collab = TeamCollaboration()
@@ -6,28 +6,121 @@ This module provides unit test generation, integration test frameworks,
 code coverage analysis, and performance benchmarking tools.
 """
 
+import ast
+import functools
 import os
 import subprocess
 import tempfile
+import threading
 import json
 import time
 import logging
 from typing import Dict, List, Tuple, Any, Optional
-from pathlib import Path
+from pathlib import Path, PurePath
 import re
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 
-class TestGenerator:
-    """Generate unit tests for converted code."""
+# Symbol extraction patterns per language, compiled once for all calls, each
+# with the keyword every match starts with. Files without the keyword are
+# skipped with a substring test instead of a regex scan. The regex engine
+# already searches for the literal keyword prefix in C, so a hand-written
+# str.find scanner is no faster: keywords like 'def' also occur inside
+# 'default' or 'undefined', and each such hit costs a Python-level check.
+# The patterns run on the raw file bytes, so files aren't decoded just to be
+# scanned; bytes 0x80-0xff count as word characters so UTF-8 identifiers
+# still match whole, and only the captured names are decoded.
+_FUNCTION_PATTERNS = {
+    'python': (b'def', re.compile(rb'def\s+([\w\x80-\xff]+)')),
+    'javascript': (b'function', re.compile(rb'function\s+([\w\x80-\xff]+)')),
+    'java': (b'public', re.compile(rb'public\s+[\w\x80-\xff]+\s+([\w\x80-\xff]+)\s*\(')),
+}
+_CLASS_PATTERNS = {
+    'python': (b'class', re.compile(rb'class\s+([\w\x80-\xff]+)')),
+    'javascript': (b'class', re.compile(rb'class\s+([\w\x80-\xff]+)')),
+    'java': (b'public', re.compile(rb'public\s+class\s+([\w\x80-\xff]+)')),
+}
+
+_PYTHON_DEFINITIONS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+def _parse_python_symbols(content: bytes) -> Optional[Tuple[List[str], List[str], Dict[str, List[str]]]]:
+    """Get the function and class names defined in Python source, in source order.
     
-    def __init__(self):
-        self.test_templates = self._load_test_templates()
-        self.coverage_data = {}
-        
-    def _load_test_templates(self) -> Dict[str, str]:
-        """Load test templates for different languages."""
-        return {
-            'python': {
-                'unittest': '''import unittest
+    Parsed with ast, so names in strings and comments are ignored and async
+    functions are included. ast decodes the bytes itself, honouring any
+    coding declaration. Also maps each class name to the methods defined
+    directly in its body. Returns None if the source doesn't parse.
+    """
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return None
+    
+    definitions = [node for node in ast.walk(tree) if isinstance(node, _PYTHON_DEFINITIONS)]
+    definitions.sort(key=lambda node: (node.lineno, node.col_offset))
+    functions = [node.name for node in definitions if not isinstance(node, ast.ClassDef)]
+    classes = [node.name for node in definitions if isinstance(node, ast.ClassDef)]
+    methods = {}
+    for node in definitions:
+        if isinstance(node, ast.ClassDef):
+            methods.setdefault(node.name, []).extend(
+                child.name for child in node.body
+                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)))
+    return functions, classes, methods
+
+def _find_symbols(content: bytes, patterns: Dict[str, Tuple[bytes, 're.Pattern']], language: str) -> List[str]:
+    """Find the names matched by the language's pattern, skipping files without its keyword"""
+    keyword, pattern = patterns.get(language, (None, None))
+    if pattern is None or keyword not in content:
+        return []
+    return [name.decode('utf-8', 'replace') for name in pattern.findall(content)]
+
+@functools.lru_cache(maxsize=1024)
+def _read_symbols(file_path: str, mtime_ns: int, size: int, language: str
+                  ) -> Tuple[Tuple[str, ...], Tuple[str, ...], Optional[Dict[str, Tuple[str, ...]]]]:
+    """Extract function and class names from a source file.
+    
+    The third item maps class names to their methods where the file could be
+    parsed (Python), and is None for files only scanned with the regexes.
+    Cached on the file's modification time and size as well as its path, so
+    an edited file is rescanned while repeated calls for the same version
+    are free.
+    """
+    with open(file_path, 'rb') as f:
+        content = f.read()
+    
+    if language == 'python':
+        symbols = _parse_python_symbols(content)
+        if symbols is not None:
+            functions, classes, methods = symbols
+            return (tuple(functions), tuple(classes),
+                    {name: tuple(names) for name, names in methods.items()})
+    
+    # Other languages, and Python that doesn't parse, use the regexes
+    return (tuple(_find_symbols(content, _FUNCTION_PATTERNS, language)),
+            tuple(_find_symbols(content, _CLASS_PATTERNS, language)), None)
+
+# Below this many test files the writes go out sequentially; a thread pool
+# only pays off once there are enough to overlap
+_PARALLEL_WRITE_THRESHOLD = 4
+
+def _compile_template(template: str):
+    """Compile a str.format test template into a render function.
+    
+    The template becomes the body of an f-string, so rendering is a plain
+    call instead of parsing the format string again each time.
+    """
+    source = ("lambda ClassName, FunctionName, function_name, filename: f"
+              + repr(template))
+    try:
+        return eval(compile(source, '<test template>', 'eval'))
+    except SyntaxError:
+        return template.format
+
+# Test file templates per language and test framework
+_TEST_TEMPLATES = {
+    'python': {
+        'unittest': '''import unittest
 import sys
 import os
 sys.path.append(os.path.dirname(__file__))
@@ -50,7 +143,7 @@ class Test{ClassName}(unittest.TestCase):
 if __name__ == '__main__':
     unittest.main()
 ''',
-                'pytest': '''import pytest
+        'pytest': '''import pytest
 import sys
 import os
 sys.path.append(os.path.dirname(__file__))
@@ -65,9 +158,9 @@ def test_{function_name}_edge_cases():
     # TODO: Add edge case tests
     assert True
 '''
-            },
-            'javascript': {
-                'jest': '''const {ClassName} = require('./{filename}');
+    },
+    'javascript': {
+        'jest': '''const {ClassName} = require('./{filename}');
 
 describe('{ClassName}', () => {{
     test('{function_name} basic functionality', () => {{
@@ -81,7 +174,7 @@ describe('{ClassName}', () => {{
     }});
 }});
 ''',
-                'mocha': '''const assert = require('assert');
+        'mocha': '''const assert = require('assert');
 const {ClassName} = require('./{filename}');
 
 describe('{ClassName}', () => {{
@@ -96,9 +189,9 @@ describe('{ClassName}', () => {{
     }});
 }});
 '''
-            },
-            'java': {
-                'junit': '''import org.junit.Test;
+    },
+    'java': {
+        'junit': '''import org.junit.Test;
 import static org.junit.Assert.*;
 
 public class Test{ClassName} {{
@@ -116,30 +209,51 @@ public class Test{ClassName} {{
     }}
 }}
 '''
-            }
-        }
+    }
+}
+
+@functools.lru_cache(maxsize=None)
+def _template_renderer(language: str, framework: str):
+    """Get the compiled render function for a template, compiling it on first use"""
+    return _compile_template(_TEST_TEMPLATES[language][framework])
+
+class TestGenerator:
+    """Generate unit tests for converted code."""
+    
+    def __init__(self):
+        self.coverage_data = {}
+    
+    @property
+    def test_templates(self) -> Dict[str, Dict[str, str]]:
+        """Test templates for different languages, shared by all generators."""
+        return _TEST_TEMPLATES
     
     def generate_tests(self, source_file: str, target_file: str, 
                       language: str, framework: str = 'default') -> Dict[str, Any]:
         """Generate unit tests for converted code."""
         try:
             # Analyze source file to extract functions and classes
-            functions = self._extract_functions(source_file, language)
-            classes = self._extract_classes(source_file, language)
+            functions, classes = self._extract_symbols(source_file, language)
+            class_methods = self._extract_class_methods(source_file, language)
+            
+            # Test files go next to the target; parse its path once for all of them
+            test_dir = PurePath(target_file).parent
+            test_extension = self._get_test_extension(language)
             
             test_files = []
+            # Test file path -> content, written together once all are generated
+            test_outputs = {}
             
             # Generate tests for each class
             for class_name in classes:
                 test_content = self._generate_class_tests(
-                    class_name, functions, target_file, language, framework
+                    class_name, functions, target_file, language, framework,
+                    class_methods.get(class_name) if class_methods is not None else None
                 )
                 
-                test_filename = f"test_{class_name.lower()}.{self._get_test_extension(language)}"
-                test_path = os.path.join(os.path.dirname(target_file), test_filename)
-                
-                with open(test_path, 'w', encoding='utf-8') as f:
-                    f.write(test_content)
+                test_path = str(test_dir / f"test_{class_name.lower()}.{test_extension}")
+                # Classes differing only in case share a file; the last one wins
+                test_outputs[test_path] = test_content
                 
                 test_files.append({
                     'path': test_path,
@@ -148,17 +262,16 @@ public class Test{ClassName} {{
                 })
             
             # Generate tests for standalone functions
-            standalone_functions = [f for f in functions if not any(f in c for c in classes)]
+            # Names shared with a class (e.g. a factory) are covered by its tests
+            class_names = set(classes)
+            standalone_functions = [f for f in functions if f not in class_names]
             if standalone_functions:
                 test_content = self._generate_function_tests(
                     standalone_functions, target_file, language, framework
                 )
                 
-                test_filename = f"test_functions.{self._get_test_extension(language)}"
-                test_path = os.path.join(os.path.dirname(target_file), test_filename)
-                
-                with open(test_path, 'w', encoding='utf-8') as f:
-                    f.write(test_content)
+                test_path = str(test_dir / f"test_functions.{test_extension}")
+                test_outputs[test_path] = test_content
                 
                 test_files.append({
                     'path': test_path,
@@ -166,6 +279,8 @@ public class Test{ClassName} {{
                     'framework': framework
                 })
             
+            self._write_test_files(test_outputs)
+            
             return {
                 'success': True,
                 'test_files': test_files,
@@ -180,71 +295,85 @@ public class Test{ClassName} {{
                 'error': str(e)
             }
     
-    def _extract_functions(self, file_path: str, language: str) -> List[str]:
-        """Extract function names from source file."""
+    def _write_test_files(self, test_outputs: Dict[str, str]):
+        """Write generated test files, concurrently when there are several."""
+        def write(item):
+            path, content = item
+            Path(path).write_bytes(content.encode('utf-8'))
+        
+        if len(test_outputs) < _PARALLEL_WRITE_THRESHOLD:
+            for item in test_outputs.items():
+                write(item)
+            return
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            # list() re-raises the first write error, as a sequential loop would
+            list(executor.map(write, test_outputs.items()))
+    
+    def _extract_symbols(self, file_path: str, language: str) -> Tuple[List[str], List[str]]:
+        """Extract function and class names from source file with a single read."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            functions = []
-            
-            if language == 'python':
-                functions = re.findall(r'def\s+(\w+)', content)
-            elif language == 'javascript':
-                functions = re.findall(r'function\s+(\w+)', content)
-            elif language == 'java':
-                functions = re.findall(r'public\s+\w+\s+(\w+)\s*\(', content)
-            
-            return functions
+            stat = os.stat(file_path)
+            functions, classes, _ = _read_symbols(file_path, stat.st_mtime_ns, stat.st_size, language)
+            return list(functions), list(classes)
             
         except Exception as e:
-            logging.error(f"Error extracting functions: {e}")
-            return []
+            logging.error(f"Error extracting symbols: {e}")
+            return [], []
     
-    def _extract_classes(self, file_path: str, language: str) -> List[str]:
-        """Extract class names from source file."""
+    def _extract_class_methods(self, file_path: str, language: str) -> Optional[Dict[str, List[str]]]:
+        """Map class names to their methods, or None where only regexes apply."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            classes = []
-            
-            if language == 'python':
-                classes = re.findall(r'class\s+(\w+)', content)
-            elif language == 'javascript':
-                classes = re.findall(r'class\s+(\w+)', content)
-            elif language == 'java':
-                classes = re.findall(r'public\s+class\s+(\w+)', content)
-            
-            return classes
+            stat = os.stat(file_path)
+            methods = _read_symbols(file_path, stat.st_mtime_ns, stat.st_size, language)[2]
+            return {name: list(names) for name, names in methods.items()} if methods is not None else None
             
         except Exception as e:
-            logging.error(f"Error extracting classes: {e}")
-            return []
+            logging.error(f"Error extracting symbols: {e}")
+            return None
+    
+    def _extract_functions(self, file_path: str, language: str) -> List[str]:
+        """Extract function names from source file."""
+        return self._extract_symbols(file_path, language)[0]
+    
+    def _extract_classes(self, file_path: str, language: str) -> List[str]:
+        """Extract class names from source file."""
+        return self._extract_symbols(file_path, language)[1]
     
     def _generate_class_tests(self, class_name: str, functions: List[str], 
-                            target_file: str, language: str, framework: str) -> str:
-        """Generate tests for a specific class."""
-        if language not in self.test_templates:
+                            target_file: str, language: str, framework: str,
+                            methods: Optional[List[str]] = None) -> str:
+        """Generate tests for a specific class.
+        
+        methods are the class's own methods when the source could be parsed;
+        otherwise functions whose name occurs in the class name are used.
+        """
+        templates = _TEST_TEMPLATES.get(language)
+        if templates is None:
             return f"# Test template not available for {language}"
         
         if framework == 'default':
             framework = self._get_default_framework(language)
         
-        if framework not in self.test_templates[language]:
+        if framework not in templates:
             return f"# Test framework {framework} not available for {language}"
         
-        template = self.test_templates[language][framework]
+        render = _template_renderer(language, framework)
         filename = os.path.basename(target_file)
         
         # Find functions that belong to this class
-        class_functions = [f for f in functions if f.lower() in class_name.lower()]
+        if methods is not None:
+            # Prefer public methods over __init__ and other private ones
+            class_functions = [m for m in methods if not m.startswith('_')] or methods
+        else:
+            class_key = class_name.lower()
+            class_functions = [f for f in functions if f.lower() in class_key]
         if not class_functions:
             class_functions = ['main']  # Default function
         
         function_name = class_functions[0]
         
-        return template.format(
+        return render(
             ClassName=class_name,
             FunctionName=function_name.capitalize(),
             function_name=function_name,
@@ -254,21 +383,22 @@ public class Test{ClassName} {{
     def _generate_function_tests(self, functions: List[str], target_file: str, 
                                language: str, framework: str) -> str:
         """Generate tests for standalone functions."""
-        if language not in self.test_templates:
+        templates = _TEST_TEMPLATES.get(language)
+        if templates is None:
             return f"# Test template not available for {language}"
         
         if framework == 'default':
             framework = self._get_default_framework(language)
         
-        if framework not in self.test_templates[language]:
+        if framework not in templates:
             return f"# Test framework {framework} not available for {language}"
         
-        template = self.test_templates[language][framework]
+        render = _template_renderer(language, framework)
         filename = os.path.basename(target_file)
         
         function_name = functions[0] if functions else 'main'
         
-        return template.format(
+        return render(
             ClassName='Functions',
             FunctionName=function_name.capitalize(),
             function_name=function_name,
@@ -293,6 +423,9 @@ public class Test{ClassName} {{
         }
         return extensions.get(language, 'py')
 
+# Total row of NYC's text summary, e.g. "All files |   85.71 | ..."
+_NYC_TOTAL_PATTERN = re.compile(rb'All files\s+\|\s+(\d+)')
+
 class CoverageAnalyzer:
     """Analyze code coverage for converted projects."""
     
@@ -335,26 +468,35 @@ class CoverageAnalyzer:
             result = subprocess.run(
                 ['coverage', 'run', '--source=.', '-m', 'pytest'],
                 cwd=project_path,
-                capture_output=True,
-                text=True
+                capture_output=True
             )
             
-            # Generate coverage report
-            report_result = subprocess.run(
-                ['coverage', 'report'],
-                cwd=project_path,
-                capture_output=True,
-                text=True
-            )
+            # Export the results as JSON rather than scraping the text report.
+            # A temp file works with every coverage version, unlike `-o -`.
+            fd, report_path = tempfile.mkstemp(suffix='.json')
+            os.close(fd)
+            try:
+                report_result = subprocess.run(
+                    ['coverage', 'json', '-q', '-o', report_path],
+                    cwd=project_path,
+                    capture_output=True
+                )
+                report = {}
+                if report_result.returncode == 0:
+                    with open(report_path, 'rb') as f:
+                        report = json.load(f)
+            finally:
+                os.remove(report_path)
             
             # Parse coverage data
-            coverage_data = self._parse_python_coverage(report_result.stdout)
+            coverage_data = self._parse_python_coverage(report)
             
             return {
                 'success': True,
                 'coverage': coverage_data,
-                'output': report_result.stdout,
-                'errors': report_result.stderr
+                'output': self._decode_output(result.stdout),
+                # The test run's stderr, then any from exporting the report
+                'errors': self._decode_output(result.stderr + report_result.stderr)
             }
             
         except Exception as e:
@@ -363,31 +505,28 @@ class CoverageAnalyzer:
                 'error': str(e)
             }
     
-    def _parse_python_coverage(self, output: str) -> Dict[str, Any]:
-        """Parse Python coverage output."""
-        lines = output.split('\n')
+    def _parse_python_coverage(self, report: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse a Python coverage JSON report."""
         coverage_data = {
             'total_coverage': 0,
             'file_coverage': {},
             'missing_lines': []
         }
         
-        for line in lines:
-            if 'TOTAL' in line:
-                # Extract total coverage percentage
-                match = re.search(r'(\d+)%', line)
-                if match:
-                    coverage_data['total_coverage'] = int(match.group(1))
-            elif '.py' in line and '%' in line:
-                # Extract file coverage
-                parts = line.split()
-                if len(parts) >= 4:
-                    filename = parts[0]
-                    coverage = int(parts[-1].replace('%', ''))
-                    coverage_data['file_coverage'][filename] = coverage
+        # The display values are the rounded percentages `coverage report` shows
+        totals = report.get('totals')
+        if totals:
+            coverage_data['total_coverage'] = self._coverage_percent(totals)
+        for filename, file_data in report.get('files', {}).items():
+            coverage_data['file_coverage'][filename] = self._coverage_percent(file_data['summary'])
         
         return coverage_data
     
+    def _coverage_percent(self, summary: Dict[str, Any]):
+        """Get a coverage JSON summary's percentage, as an int unless precision is configured"""
+        percent = str(summary.get('percent_covered_display', round(summary.get('percent_covered', 0))))
+        return float(percent) if '.' in percent else int(percent)
+    
     def _run_javascript_coverage(self, project_path: str) -> Dict[str, Any]:
         """Run JavaScript coverage analysis."""
         try:
@@ -395,8 +534,7 @@ class CoverageAnalyzer:
             result = subprocess.run(
                 ['npx', 'nyc', 'npm', 'test'],
                 cwd=project_path,
-                capture_output=True,
-                text=True
+                capture_output=True
             )
             
             # Parse coverage data
@@ -405,8 +543,8 @@ class CoverageAnalyzer:
             return {
                 'success': True,
                 'coverage': coverage_data,
-                'output': result.stdout,
-                'errors': result.stderr
+                'output': self._decode_output(result.stdout),
+                'errors': self._decode_output(result.stderr)
             }
             
         except Exception as e:
@@ -415,7 +553,11 @@ class CoverageAnalyzer:
                 'error': str(e)
             }
     
-    def _parse_javascript_coverage(self, output: str) -> Dict[str, Any]:
+    def _decode_output(self, output: bytes) -> str:
+        """Decode a coverage tool's captured output for the results"""
+        return output.decode('utf-8', errors='replace')
+    
+    def _parse_javascript_coverage(self, output: bytes) -> Dict[str, Any]:
         """Parse JavaScript coverage output."""
         coverage_data = {
             'total_coverage': 0,
@@ -423,10 +565,16 @@ class CoverageAnalyzer:
             'missing_lines': []
         }
         
-        # Extract coverage percentage from NYC output
-        match = re.search(r'All files\s+\|\s+(\d+)', output)
-        if match:
-            coverage_data['total_coverage'] = int(match.group(1))
+        # Extract coverage percentage from NYC output. Locate the summary row
+        # with bytes.find and only run the regex from there; the output is
+        # parsed undecoded, and int() takes the captured digits as bytes.
+        idx = output.find(b'All files')
+        while idx >= 0:
+            match = _NYC_TOTAL_PATTERN.match(output, idx)
+            if match:
+                coverage_data['total_coverage'] = int(match.group(1))
+                break
+            idx = output.find(b'All files', idx + 1)
         
         return coverage_data
     
@@ -437,8 +585,7 @@ class CoverageAnalyzer:
             result = subprocess.run(
                 ['mvn', 'clean', 'test', 'jacoco:report'],
                 cwd=project_path,
-                capture_output=True,
-                text=True
+                capture_output=True
             )
             
             # Parse coverage data
@@ -447,8 +594,8 @@ class CoverageAnalyzer:
             return {
                 'success': True,
                 'coverage': coverage_data,
-                'output': result.stdout,
-                'errors': result.stderr
+                'output': self._decode_output(result.stdout),
+                'errors': self._decode_output(result.stderr)
             }
             
         except Exception as e:
@@ -465,14 +612,132 @@ class CoverageAnalyzer:
             'missing_lines': []
         }
         
-        # Look for JaCoCo report
-        jacoco_report = os.path.join(project_path, 'target', 'site', 'jacoco', 'index.html')
-        if os.path.exists(jacoco_report):
-            # Parse HTML report for coverage data
-            coverage_data['total_coverage'] = 50  # Placeholder
-            coverage_data['file_coverage'] = {}
+        # JaCoCo writes an XML report next to the HTML one; it is much
+        # smaller and can be streamed rather than loaded whole
+        jacoco_report = os.path.join(project_path, 'target', 'site', 'jacoco', 'jacoco.xml')
+        if not os.path.exists(jacoco_report):
+            return coverage_data
+        
+        package = ''
+        for event, elem in ET.iterparse(jacoco_report, events=('start', 'end')):
+            if event == 'start':
+                if elem.tag == 'package':
+                    package = elem.get('name', '')
+                continue
+            
+            if elem.tag == 'sourcefile':
+                percent = self._line_coverage_percent(elem)
+                if percent is not None:
+                    filename = f"{package}/{elem.get('name')}" if package else elem.get('name')
+                    coverage_data['file_coverage'][filename] = percent
+                elem.clear()
+            elif elem.tag in ('class', 'package'):
+                # Done with this part of the tree; drop it to keep memory bounded
+                elem.clear()
+            elif elem.tag == 'report':
+                percent = self._line_coverage_percent(elem)
+                if percent is not None:
+                    coverage_data['total_coverage'] = percent
         
         return coverage_data
+    
+    def _line_coverage_percent(self, elem: ET.Element) -> Optional[int]:
+        """Get the line coverage percentage from a JaCoCo element's LINE counter"""
+        for counter in elem.iterfind('counter'):
+            if counter.get('type') == 'LINE':
+                covered = int(counter.get('covered', 0))
+                total = covered + int(counter.get('missed', 0))
+                return round(100 * covered / total) if total else 0
+        return None
+
+# Shared by all benchmarks so the source and target runs can overlap
+# without creating a pool per call
+_BENCHMARK_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+# Seconds of runs timed per benchmarked file; slow programs stop after fewer
+# than the requested iterations rather than running into the timeout
+BENCHMARK_TIME_BUDGET = 5.0
+# Extra seconds allowed on top of the budget for startup and the last run
+BENCHMARK_TIMEOUT_MARGIN = 30.0
+
+# Harnesses that run a program up to `iterations` times inside one process,
+# stopping early once `budget` nanoseconds have passed, with its output
+# discarded, and print "<total nanoseconds> <runs>". Timing in the child
+# leaves interpreter/JVM startup out of the measurement.
+_PYTHON_HARNESS = """
+import contextlib, os, sys, time
+path, iterations, budget = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+sys.argv = [path]
+sys.path[0] = os.path.dirname(os.path.abspath(path))
+with open(path, 'rb') as f:
+    code = compile(f.read(), path, 'exec')
+# Taken before the program runs, so one patching time can't skew its timing
+perf_counter_ns = time.perf_counter_ns
+with open(os.devnull, 'w') as null, contextlib.redirect_stdout(null):
+    start = perf_counter_ns()
+    runs = 0
+    while runs < iterations and perf_counter_ns() - start < budget:
+        try:
+            exec(code, {'__name__': '__main__', '__file__': path, '__builtins__': __builtins__})
+        except SystemExit:
+            pass
+        runs += 1
+    elapsed = perf_counter_ns() - start
+print(elapsed, runs)
+"""
+
+_JAVASCRIPT_HARNESS = """
+const path = require('path');
+const { performance } = require('perf_hooks');
+const file = path.resolve(process.argv[1]);
+const iterations = Number(process.argv[2]);
+const budget = Number(process.argv[3]) / 1e6;
+const write = process.stdout.write;
+const now = performance.now.bind(performance);
+process.stdout.write = () => true;
+const start = now();
+let runs = 0;
+while (runs < iterations && now() - start < budget) {
+    delete require.cache[file];
+    require(file);
+    runs++;
+}
+const elapsed = now() - start;
+process.stdout.write = write;
+console.log(Math.round(elapsed * 1e6), runs);
+"""
+
+_JAVA_HARNESS = """
+public class BenchmarkHarness {
+    public static void main(String[] args) throws Exception {
+        java.lang.reflect.Method main = Class.forName(args[0]).getMethod("main", String[].class);
+        int iterations = Integer.parseInt(args[1]);
+        long budget = Long.parseLong(args[2]);
+        java.io.PrintStream out = System.out;
+        System.setOut(new java.io.PrintStream(java.io.OutputStream.nullOutputStream()));
+        long start = System.nanoTime();
+        int runs = 0;
+        while (runs < iterations && System.nanoTime() - start < budget) {
+            main.invoke(null, (Object) new String[0]);
+            runs++;
+        }
+        long elapsed = System.nanoTime() - start;
+        System.setOut(out);
+        System.out.println(elapsed + " " + runs);
+    }
+}
+"""
+
+@functools.lru_cache(maxsize=None)
+def _java_harness_dir() -> Optional[str]:
+    """Compile the Java harness once per process; None if javac fails"""
+    harness_dir = tempfile.mkdtemp(prefix='benchmark_harness_')
+    harness_path = os.path.join(harness_dir, 'BenchmarkHarness.java')
+    with open(harness_path, 'w', encoding='utf-8') as f:
+        f.write(_JAVA_HARNESS)
+    result = subprocess.run(['javac', harness_path], stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL, timeout=30)
+    return harness_dir if result.returncode == 0 else None
 
 class PerformanceBenchmark:
     """Benchmark performance of converted code."""
@@ -484,11 +749,21 @@ class PerformanceBenchmark:
                       language: str, iterations: int = 1000) -> Dict[str, Any]:
         """Benchmark performance of converted code."""
         try:
-            # Benchmark source code
-            source_time = self._benchmark_file(source_file, language, iterations)
-            
-            # Benchmark target code
-            target_time = self._benchmark_file(target_file, language, iterations)
+            # Benchmark source and target code; each run waits on its own
+            # child process, so the two can proceed concurrently
+            source_future = _BENCHMARK_EXECUTOR.submit(self._benchmark_file, source_file, language, iterations)
+            target_future = _BENCHMARK_EXECUTOR.submit(self._benchmark_file, target_file, language, iterations)
+            source_time = source_future.result()
+            target_time = target_future.result()
+            
+            # A failed or timed-out run has no per-run time to compare
+            failed = [path for path, seconds in ((source_file, source_time), (target_file, target_time))
+                      if seconds is None]
+            if failed:
+                return {
+                    'success': False,
+                    'error': f"No benchmark timing for {', '.join(failed)}"
+                }
             
             # Calculate performance metrics
             performance_ratio = target_time / source_time if source_time > 0 else 0
@@ -517,33 +792,59 @@ class PerformanceBenchmark:
                 'error': str(e)
             }
     
-    def _benchmark_file(self, file_path: str, language: str, iterations: int) -> float:
-        """Benchmark a single file."""
+    def _benchmark_file(self, file_path: str, language: str, iterations: int) -> Optional[float]:
+        """Benchmark a single file, returning the mean seconds per run.
+        
+        The file runs up to `iterations` times in one child process, timed
+        there, so process startup isn't counted; runs stop early once
+        BENCHMARK_TIME_BUDGET has passed. Returns None if no timing was
+        produced: the program failed, timed out, or the language has no harness.
+        """
         try:
-            start_time = time.time()
+            iterations = max(1, iterations)
+            budget_ns = str(int(BENCHMARK_TIME_BUDGET * 1e9))
+            command = None
             
             if language == 'python':
-                subprocess.run(['python', file_path], 
-                             capture_output=True, timeout=30)
+                command = ['python', '-c', _PYTHON_HARNESS, file_path, str(iterations), budget_ns]
             elif language == 'javascript':
-                subprocess.run(['node', file_path], 
-                             capture_output=True, timeout=30)
+                command = ['node', '-e', _JAVASCRIPT_HARNESS, file_path, str(iterations), budget_ns]
             elif language == 'java':
                 # Compile and run Java
                 class_name = os.path.splitext(os.path.basename(file_path))[0]
-                subprocess.run(['javac', file_path], 
-                             capture_output=True, timeout=30)
-                subprocess.run(['java', class_name], 
-                             capture_output=True, timeout=30)
-            
-            end_time = time.time()
-            return end_time - start_time
+                class_dir = os.path.dirname(os.path.abspath(file_path))
+                # Reuse the compiled class while it is newer than the source
+                class_path = os.path.join(class_dir, class_name + '.class')
+                if (not os.path.exists(class_path)
+                        or os.path.getmtime(class_path) < os.path.getmtime(file_path)):
+                    # The compiler output is never read, so don't pipe it
+                    subprocess.run(['javac', file_path], stdout=subprocess.DEVNULL,
+                                 stderr=subprocess.DEVNULL, timeout=30)
+                harness_dir = _java_harness_dir()
+                if harness_dir is not None:
+                    command = ['java', '-cp', os.pathsep.join([harness_dir, class_dir]),
+                               'BenchmarkHarness', class_name, str(iterations), budget_ns]
+            
+            if command is None:
+                return None
+            
+            result = subprocess.run(command, capture_output=True, text=True,
+                                    timeout=BENCHMARK_TIME_BUDGET + BENCHMARK_TIMEOUT_MARGIN)
+            
+            # The harness's last line is "<total nanoseconds> <runs>"
+            fields = result.stdout.split()[-2:]
+            if result.returncode == 0 and len(fields) == 2 and all(map(str.isdigit, fields)):
+                elapsed_ns, runs = map(int, fields)
+                if runs:
+                    return elapsed_ns / runs / 1e9
+            return None
             
         except subprocess.TimeoutExpired:
-            return 30.0  # Timeout value
+            logging.warning(f"Benchmark of {file_path} timed out")
+            return None
         except Exception as e:
             logging.error(f"Error benchmarking {file_path}: {e}")
-            return 0.0
+            return None
 
 # Global instances
 test_generator = TestGenerator()
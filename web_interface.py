@@ -4,16 +4,25 @@ Web Interface for Code Conversion Pipeline
 Provides a user-friendly web interface for converting projects between programming languages
 """
 
-from flask import Flask, render_template, request, jsonify, send_file, flash, redirect, url_for
+from flask import Flask, Request, Response, render_template, request, jsonify, send_file, flash, redirect, url_for
+from flask.json.provider import DefaultJSONProvider
 import os
 import json
 import zipfile
+import tarfile
 import tempfile
 import shutil
 from pathlib import Path
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.utils import secure_filename
 import uuid
+import itertools
+import functools
+import hashlib
+import time
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # Import our conversion pipeline
 try:
@@ -21,124 +30,231 @@ try:
 except ImportError:
     from improved_code_converter import ImprovedCodeConverter as EnhancedCodeConverter
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional libarchive bindings, for archive formats the standard library can't read
+try:
+    import libarchive
+    LIBARCHIVE_AVAILABLE = True
+except ImportError:
+    LIBARCHIVE_AVAILABLE = False
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider serializing with orjson, keeping Flask's output conventions"""
+    
+    def dumps(self, obj, **kwargs):
+        # Flask only passes indent/separators; leave any other options to json
+        if set(kwargs) <= {'indent', 'separators'}:
+            # Dates and dataclasses go through Flask's default() as before
+            option = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                      | orjson.OPT_PASSTHROUGH_DATACLASS)
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            if kwargs.get('indent'):
+                option |= orjson.OPT_INDENT_2
+            try:
+                return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+            except orjson.JSONEncodeError:
+                # e.g. integers wider than 64 bits, which json handles
+                pass
+        return super().dumps(obj, **kwargs)
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+class UploadRequest(Request):
+    """Request spooling uploaded files to named files in UPLOAD_FOLDER"""
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        # On the same filesystem as the sessions, so save_upload can link the
+        # spooled archive into place instead of copying it out again
+        return tempfile.NamedTemporaryFile('wb+', dir=UPLOAD_FOLDER, prefix='.upload-')
+
+# Views are plain WSGI handlers: each request runs on its own thread (Flask's
+# threaded dev server, or Gunicorn's gthread workers in start_web_interface.py),
+# so a long conversion only occupies its own thread, not the whole worker
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here'  # Change this in production
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+app.request_class = UploadRequest
 
 # Configuration
 UPLOAD_FOLDER = 'uploads'
 CONVERTED_FOLDER = 'converted'
-ALLOWED_EXTENSIONS = {'zip', 'tar', 'gz', 'rar'}
+ALLOWED_EXTENSIONS = {'zip', 'tar', 'gz', 'tgz', 'rar'}
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+# Reject larger requests before their body is read
+app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
+# Archives with at least this many files are extracted on several threads
+PARALLEL_EXTRACT_THRESHOLD = 16
+# Extracted files at least this large get their disk space reserved up front
+PREALLOCATE_THRESHOLD = 1 << 20
+
+# Shared by all requests for parallel file work such as extraction, so
+# threads are reused and their total stays bounded under load
+IO_EXECUTOR = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4),
+                                 thread_name_prefix='io')
+
+# Runs conversions requested with background=true, after /upload has returned
+CONVERSION_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='conversion')
+# A background conversion still unfinished this many seconds after it was
+# queued or started is reported as failed: jobs only live in the executor, so
+# one whose worker process was restarted or killed never finishes
+BACKGROUND_CONVERSION_TIMEOUT = 900
+
+# Converted files are hard-linked to one shared copy per distinct content,
+# and built download archives are kept by ETag
+OBJECTS_FOLDER = os.path.join(CONVERTED_FOLDER, '.objects')
+ARCHIVE_CACHE_FOLDER = os.path.join(CONVERTED_FOLDER, '.archives')
+
+# Session of the last successful conversion of each archive, by content hash
+UPLOAD_INDEX_FOLDER = os.path.join(UPLOAD_FOLDER, '.by_hash')
+
+# Bounds applied whenever a new download archive is cached: least recently
+# used archives go once the cache passes this size, upload index entries
+# after this many seconds, and shared objects once no session links them
+ARCHIVE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+UPLOAD_INDEX_MAX_AGE = 7 * 24 * 3600
+_prune_lock = threading.Lock()
 
 # Create directories
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+os.makedirs(UPLOAD_INDEX_FOLDER, exist_ok=True)
 os.makedirs(CONVERTED_FOLDER, exist_ok=True)
+os.makedirs(OBJECTS_FOLDER, exist_ok=True)
+os.makedirs(ARCHIVE_CACHE_FOLDER, exist_ok=True)
 os.makedirs('templates', exist_ok=True)
 os.makedirs('static', exist_ok=True)
 
+def write_json_file(path, data):
+    """Write data to path as indented JSON, with orjson when it is installed"""
+    content = None
+    if ORJSON_AVAILABLE:
+        try:
+            content = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            pass
+    if content is None:
+        content = json.dumps(data, indent=2).encode('utf-8')
+    # Replace the file in one step so a reader polling for it never sees it half written
+    part_path = path + '.part'
+    with open(part_path, 'wb') as f:
+        f.write(content)
+    os.replace(part_path, path)
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+# Next steps guidance shared by every conversion. Tuples can be handed out
+# without copying; they serialize to JSON arrays like lists do.
+WHAT_TO_DO = (
+    "Download the converted project",
+    "Review the converted code",
+    "Test the converted project",
+    "Make manual adjustments if needed"
+)
+
+IMPORTANT_NOTES = (
+    "This is an automated conversion",
+    "Manual review is recommended",
+    "Test thoroughly before production use",
+    "Check for security implications"
+)
+
+DETAILED_GUIDANCE = {
+    "review_code": (
+        "Check for syntax errors in the target language",
+        "Verify that all functions and logic are preserved",
+        "Review variable names and data types",
+        "Ensure proper error handling and exceptions",
+        "Check for language-specific best practices"
+    ),
+    "test_project": (
+        "Run the converted code with sample inputs",
+        "Compare output with the original program",
+        "Test edge cases and error conditions",
+        "Check for memory leaks or performance issues",
+        "Verify all dependencies are properly included"
+    ),
+    "security_considerations": (
+        "Review input validation and sanitization",
+        "Check for potential injection vulnerabilities",
+        "Verify secure handling of sensitive data",
+        "Ensure proper authentication and authorization",
+        "Review file and network access permissions"
+    )
+}
+
+# Extra next steps for each conversion type
+CONVERSION_SPECIFIC_NOTES = {
+    "c_to_python": (
+        "Review memory management (C pointers converted to Python references)",
+        "Check for C-specific optimizations that may need Python equivalents",
+        "Verify that C structs are properly converted to Python classes",
+        "Review any platform-specific code that may not work in Python"
+    ),
+    "python_to_javascript": (
+        "Review Python-specific libraries that may not have JS equivalents",
+        "Check for Python list comprehensions converted to JavaScript",
+        "Verify that Python exceptions are properly converted to JavaScript error handling",
+        "Review any Python-specific syntax that may need manual adjustment"
+    ),
+    "python_to_java": (
+        "Review Python dynamic typing converted to Java static typing",
+        "Check for Python list comprehensions converted to Java streams",
+        "Verify that Python exceptions are properly converted to Java exceptions",
+        "Review any Python-specific libraries that may need Java equivalents"
+    ),
+    "java_to_python": (
+        "Review Java static typing converted to Python dynamic typing",
+        "Check for Java interfaces and abstract classes converted to Python",
+        "Verify that Java exceptions are properly converted to Python exceptions",
+        "Review any Java-specific libraries that may need Python equivalents"
+    ),
+    "javascript_to_python": (
+        "Review JavaScript async/await converted to Python async/await",
+        "Check for JavaScript promises converted to Python asyncio",
+        "Verify that JavaScript objects are properly converted to Python dictionaries",
+        "Review any JavaScript-specific libraries that may need Python equivalents"
+    ),
+    "typescript_to_python": (
+        "Review TypeScript type annotations removed for Python dynamic typing",
+        "Check for TypeScript interfaces converted to Python classes or type hints",
+        "Verify that TypeScript enums are properly converted to Python enums",
+        "Review any TypeScript-specific features that may need Python equivalents"
+    ),
+    "java_to_javascript": (
+        "Review Java static typing converted to JavaScript dynamic typing",
+        "Check for Java interfaces and abstract classes converted to JavaScript",
+        "Verify that Java exceptions are properly converted to JavaScript error handling",
+        "Review any Java-specific libraries that may need JavaScript equivalents"
+    ),
+    "javascript_to_java": (
+        "Review JavaScript dynamic typing converted to Java static typing",
+        "Check for JavaScript async/await converted to Java CompletableFuture",
+        "Verify that JavaScript objects are properly converted to Java classes",
+        "Review any JavaScript-specific libraries that may need Java equivalents"
+    )
+}
+
 def generate_next_steps_guidance(conversion_type, ai_used, files_converted, errors):
     """Generate next steps guidance based on conversion results"""
     guidance = {
-        "what_to_do": [
-            "Download the converted project",
-            "Review the converted code",
-            "Test the converted project", 
-            "Make manual adjustments if needed"
-        ],
-        "important_notes": [
-            "This is an automated conversion",
-            "Manual review is recommended",
-            "Test thoroughly before production use",
-            "Check for security implications"
-        ],
-        "detailed_guidance": {
-            "review_code": [
-                "Check for syntax errors in the target language",
-                "Verify that all functions and logic are preserved",
-                "Review variable names and data types",
-                "Ensure proper error handling and exceptions",
-                "Check for language-specific best practices"
-            ],
-            "test_project": [
-                "Run the converted code with sample inputs",
-                "Compare output with the original program",
-                "Test edge cases and error conditions",
-                "Check for memory leaks or performance issues",
-                "Verify all dependencies are properly included"
-            ],
-            "security_considerations": [
-                "Review input validation and sanitization",
-                "Check for potential injection vulnerabilities",
-                "Verify secure handling of sensitive data",
-                "Ensure proper authentication and authorization",
-                "Review file and network access permissions"
-            ]
-        },
-        "conversion_specific_notes": []
+        "what_to_do": WHAT_TO_DO,
+        "important_notes": IMPORTANT_NOTES,
+        "detailed_guidance": dict(DETAILED_GUIDANCE),
+        # Add conversion-specific guidance
+        "conversion_specific_notes": list(CONVERSION_SPECIFIC_NOTES.get(conversion_type, ()))
     }
     
-    # Add conversion-specific guidance
-    if conversion_type == "c_to_python":
-        guidance["conversion_specific_notes"].extend([
-            "Review memory management (C pointers converted to Python references)",
-            "Check for C-specific optimizations that may need Python equivalents",
-            "Verify that C structs are properly converted to Python classes",
-            "Review any platform-specific code that may not work in Python"
-        ])
-    elif conversion_type == "python_to_javascript":
-        guidance["conversion_specific_notes"].extend([
-            "Review Python-specific libraries that may not have JS equivalents",
-            "Check for Python list comprehensions converted to JavaScript",
-            "Verify that Python exceptions are properly converted to JavaScript error handling",
-            "Review any Python-specific syntax that may need manual adjustment"
-        ])
-    elif conversion_type == "python_to_java":
-        guidance["conversion_specific_notes"].extend([
-            "Review Python dynamic typing converted to Java static typing",
-            "Check for Python list comprehensions converted to Java streams",
-            "Verify that Python exceptions are properly converted to Java exceptions",
-            "Review any Python-specific libraries that may need Java equivalents"
-        ])
-    elif conversion_type == "java_to_python":
-        guidance["conversion_specific_notes"].extend([
-            "Review Java static typing converted to Python dynamic typing",
-            "Check for Java interfaces and abstract classes converted to Python",
-            "Verify that Java exceptions are properly converted to Python exceptions",
-            "Review any Java-specific libraries that may need Python equivalents"
-        ])
-    elif conversion_type == "javascript_to_python":
-        guidance["conversion_specific_notes"].extend([
-            "Review JavaScript async/await converted to Python async/await",
-            "Check for JavaScript promises converted to Python asyncio",
-            "Verify that JavaScript objects are properly converted to Python dictionaries",
-            "Review any JavaScript-specific libraries that may need Python equivalents"
-        ])
-    elif conversion_type == "typescript_to_python":
-        guidance["conversion_specific_notes"].extend([
-            "Review TypeScript type annotations removed for Python dynamic typing",
-            "Check for TypeScript interfaces converted to Python classes or type hints",
-            "Verify that TypeScript enums are properly converted to Python enums",
-            "Review any TypeScript-specific features that may need Python equivalents"
-        ])
-    elif conversion_type == "java_to_javascript":
-        guidance["conversion_specific_notes"].extend([
-            "Review Java static typing converted to JavaScript dynamic typing",
-            "Check for Java interfaces and abstract classes converted to JavaScript",
-            "Verify that Java exceptions are properly converted to JavaScript error handling",
-            "Review any Java-specific libraries that may need JavaScript equivalents"
-        ])
-    elif conversion_type == "javascript_to_java":
-        guidance["conversion_specific_notes"].extend([
-            "Review JavaScript dynamic typing converted to Java static typing",
-            "Check for JavaScript async/await converted to Java CompletableFuture",
-            "Verify that JavaScript objects are properly converted to Java classes",
-            "Review any JavaScript-specific libraries that may need Java equivalents"
-        ])
-    
     # Add AI-specific guidance
     if ai_used:
         guidance["conversion_specific_notes"].append(
@@ -153,23 +269,424 @@ def generate_next_steps_guidance(conversion_type, ai_used, files_converted, erro
     
     return guidance
 
+def _safe_member_path(extract_root, member_name):
+    """Destination for an archive member, or None if it would land outside extract_root"""
+    dest = os.path.normpath(os.path.join(extract_root, member_name))
+    if os.path.commonpath([extract_root, dest]) != extract_root or dest == extract_root:
+        return None
+    return dest
+
+def _write_member(chunks, dest, size):
+    """Write an archive member's data, given as chunks of bytes, to dest"""
+    # Write under a temporary name so a failed member never leaves a
+    # truncated file behind. The name is unique, so it can't be another
+    # member of the archive, which may be extracting on another thread
+    part_path = f'{dest}.{uuid.uuid4().hex}.part'
+    fd = os.open(part_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        # Reserving the whole size lets the filesystem allocate contiguous extents
+        if size >= PREALLOCATE_THRESHOLD and hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(fd, 0, size)
+            except OSError:
+                pass  # Not supported by this filesystem
+        # Chunks of at least the buffer size bypass the buffer; it only ensures
+        # short writes are completed
+        with os.fdopen(fd, 'wb') as dst:
+            for chunk in chunks:
+                dst.write(chunk)
+        os.replace(part_path, dest)
+    finally:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+def _read_chunks(src, size):
+    """Read a file object in chunks sized to its data, up to 1 MiB"""
+    return iter(functools.partial(src.read, min(size, 1 << 20) or 1), b'')
+
+def _extract_zip_members(file_path, members):
+    """Extract (ZipInfo, destination) pairs using a ZipFile handle of their own"""
+    with zipfile.ZipFile(file_path, 'r') as zip_ref:
+        for member, dest in members:
+            with zip_ref.open(member) as src:
+                _write_member(_read_chunks(src, member.file_size), dest, member.file_size)
+
+def _extract_tar(file_path, extract_root, mode):
+    """Extract a tar archive in a single forward pass, one member at a time"""
+    # Stream modes ('r|') never seek, so memory use doesn't grow with the archive
+    with tarfile.open(file_path, mode) as tar_ref:
+        for member in tar_ref:
+            # Only regular files: links and devices could point outside the target
+            if not member.isfile() or member.name.startswith('__MACOSX/'):
+                continue
+            dest = _safe_member_path(extract_root, member.name)
+            if dest is None:
+                continue
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            with tar_ref.extractfile(member) as src:
+                _write_member(_read_chunks(src, member.size), dest, member.size)
+
+def _extract_with_libarchive(file_path, extract_root):
+    """Extract any archive format libarchive reads (e.g. RAR), one entry at a time"""
+    with libarchive.file_reader(file_path) as archive:
+        for entry in archive:
+            if not entry.isfile or entry.pathname.startswith('__MACOSX/'):
+                continue
+            dest = _safe_member_path(extract_root, entry.pathname)
+            if dest is None:
+                continue
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            _write_member(entry.get_blocks(), dest, entry.size or 0)
+
 def extract_project(file_path, extract_dir):
     """Extract uploaded project archive"""
     try:
         if file_path.endswith('.zip'):
+            extract_root = os.path.abspath(extract_dir)
+            # Destination -> member; a name repeated in the archive keeps its last entry
+            members = {}
             with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                zip_ref.extractall(extract_dir)
+                for member in zip_ref.infolist():
+                    # Directories are created for the files in them; macOS
+                    # resource forks and paths escaping the target are dropped
+                    if member.is_dir() or member.filename.startswith('__MACOSX/'):
+                        continue
+                    dest = _safe_member_path(extract_root, member.filename)
+                    if dest is not None:
+                        members[dest] = member
+            
+            for directory in {os.path.dirname(dest) for dest in members}:
+                os.makedirs(directory, exist_ok=True)
+            
+            pairs = [(member, dest) for dest, member in members.items()]
+            workers = min(os.cpu_count() or 1, len(pairs) // PARALLEL_EXTRACT_THRESHOLD + 1)
+            if workers <= 1:
+                _extract_zip_members(file_path, pairs)
+            else:
+                # Zip members are independent, and a ZipFile handle can't be
+                # shared between threads, so each batch opens its own.
+                # list() waits for all batches and re-raises the first error.
+                list(IO_EXECUTOR.map(_extract_zip_members, [file_path] * workers,
+                                     [pairs[i::workers] for i in range(workers)]))
+        elif file_path.endswith(('.tar.gz', '.tgz')):
+            _extract_tar(file_path, os.path.abspath(extract_dir), 'r|gz')
+        elif file_path.endswith('.tar'):
+            _extract_tar(file_path, os.path.abspath(extract_dir), 'r|')
+        elif LIBARCHIVE_AVAILABLE:
+            _extract_with_libarchive(file_path, os.path.abspath(extract_dir))
         # Add support for other archive types as needed
         return True
     except Exception as e:
         print(f"Extraction error: {e}")
         return False
 
+def find_project_dir(directory):
+    """Descend through directories whose only entry is another directory"""
+    while True:
+        # Two entries are enough to tell; is_dir() uses the cached entry type
+        with os.scandir(directory) as it:
+            entries = list(itertools.islice(it, 2))
+        if len(entries) == 1 and entries[0].is_dir():
+            directory = entries[0].path
+        else:
+            return directory
+
+class _ZipStreamBuffer:
+    """Write-only file object collecting the bytes ZipFile produces until drained"""
+    
+    def __init__(self):
+        self.chunks = []
+    
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+def deduplicate_tree(directory):
+    """Replace each file in directory with a hard link to the shared copy of its content"""
+    # Converted trees are written once, so sharing inodes between them is safe
+    for root, dirs, files in os.walk(directory):
+        for file in files:
+            file_path = os.path.join(root, file)
+            digest = hashlib.blake2b(digest_size=16)
+            with open(file_path, 'rb') as f:
+                while chunk := f.read(1 << 20):
+                    digest.update(chunk)
+            blob_path = os.path.join(OBJECTS_FOLDER, digest.hexdigest())
+            try:
+                if os.path.exists(blob_path):
+                    link_path = f'{file_path}.{uuid.uuid4().hex}.link'
+                    os.link(blob_path, link_path)
+                    os.replace(link_path, file_path)
+                else:
+                    os.link(file_path, blob_path)
+            except OSError:
+                # No hard links on this filesystem, or another conversion
+                # stored the same content first; keep the file as it is
+                continue
+
+def walk_files(directory, sort=False):
+    """Yield (relative path, stat result, opener) for every file under directory.
+    
+    Where os.fwalk is available, files are stat'ed and opened relative to
+    their directory's descriptor rather than resolving the full path each
+    time. The opener returns a read-only file descriptor.
+    """
+    if hasattr(os, 'fwalk'):
+        for root, dirs, files, dir_fd in os.fwalk(directory):
+            rel_root = os.path.relpath(root, directory)
+            if sort:
+                dirs.sort()
+                files.sort()
+            for file in files:
+                yield (os.path.normpath(os.path.join(rel_root, file)),
+                       os.stat(file, dir_fd=dir_fd),
+                       functools.partial(os.open, file, os.O_RDONLY, dir_fd=dir_fd))
+    else:
+        for root, dirs, files in os.walk(directory):
+            if sort:
+                dirs.sort()
+                files.sort()
+            for file in files:
+                file_path = os.path.join(root, file)
+                yield (os.path.relpath(file_path, directory),
+                       os.stat(file_path),
+                       functools.partial(os.open, file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0)))
+
+def tree_etag(directory, compression):
+    """ETag for the zip of directory: changes whenever a file's path, inode, size or mtime does"""
+    digest = hashlib.blake2b(str(compression).encode(), digest_size=16)
+    # Walk order depends on the filesystem; the tag must not
+    for rel_path, st, _ in walk_files(directory, sort=True):
+        digest.update(f"{rel_path}\0{st.st_ino}\0"
+                      f"{st.st_size}\0{st.st_mtime_ns}\0".encode())
+    return digest.hexdigest()
+
+def _zipinfo_from_stat(arcname, st):
+    """Build the ZipInfo that ZipInfo.from_file would, from an existing stat result"""
+    zinfo = zipfile.ZipInfo(arcname.replace(os.sep, '/'), time.localtime(st.st_mtime)[0:6])
+    zinfo.external_attr = (st.st_mode & 0xFFFF) << 16
+    zinfo.file_size = st.st_size
+    return zinfo
+
+def stream_zip(directory, compression=zipfile.ZIP_STORED):
+    """Yield a zip archive of directory piece by piece as it is written"""
+    # Without tell()/seek(), ZipFile writes sizes after each member's data
+    buffer = _ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression) as zipf:
+        for arcname, st, opener in walk_files(directory):
+            zinfo = _zipinfo_from_stat(arcname, st)
+            zinfo.compress_type = compression
+            if not zinfo.file_size:
+                # Nothing to read; just record the entry
+                zipf.writestr(zinfo, b'')
+                continue
+            # Read straight into chunks of at most 1 MiB, without a buffer layer
+            chunk_size = min(zinfo.file_size, 1 << 20)
+            with os.fdopen(opener(), 'rb', buffering=0) as src, zipf.open(zinfo, 'w') as dst:
+                while chunk := src.read(chunk_size):
+                    dst.write(chunk)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+    # The remaining member data and the central directory
+    yield buffer.drain()
+
+def tee_to_file(chunks, path, on_complete=None):
+    """Yield chunks while also saving them to path, which appears only once complete"""
+    part_path = f'{path}.{uuid.uuid4().hex}.part'
+    try:
+        with open(part_path, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                yield chunk
+        os.replace(part_path, path)
+        if on_complete is not None:
+            on_complete()
+    finally:
+        # Left behind if the client disconnected or the archive failed
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+def _remove_quietly(path):
+    """Remove a file, ignoring one that is already gone"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def prune_caches():
+    """Bound the download archive cache, upload index and shared object store"""
+    # One pass at a time is enough; a pass already running covers this request
+    if not _prune_lock.acquire(blocking=False):
+        return
+    try:
+        # Archives are touched when served, so the oldest are least recently used
+        archives = []
+        with os.scandir(ARCHIVE_CACHE_FOLDER) as entries:
+            for entry in entries:
+                if entry.name.endswith('.zip') and entry.is_file():
+                    stat = entry.stat()
+                    archives.append((stat.st_mtime, stat.st_size, entry.path))
+        archives.sort(reverse=True)
+        total = 0
+        for _, size, path in archives:
+            total += size
+            if total > ARCHIVE_CACHE_MAX_BYTES:
+                _remove_quietly(path)
+        
+        # Index entries naming sessions without results can't be reused either
+        expiry = time.time() - UPLOAD_INDEX_MAX_AGE
+        with os.scandir(UPLOAD_INDEX_FOLDER) as entries:
+            for entry in entries:
+                if entry.stat().st_mtime < expiry or find_converted_upload(entry.path) is None:
+                    _remove_quietly(entry.path)
+        
+        # An object whose only link is its own entry belongs to no session any more
+        with os.scandir(OBJECTS_FOLDER) as entries:
+            for entry in entries:
+                if entry.stat().st_nlink == 1:
+                    _remove_quietly(entry.path)
+    except OSError as e:
+        print(f"Error pruning caches: {e}")
+    finally:
+        _prune_lock.release()
+
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(error):
+    """Report an oversized upload as JSON, like other upload failures"""
+    return jsonify({
+        'success': False,
+        'error': f'File too large (max {MAX_FILE_SIZE // (1024 * 1024)}MB)'
+    }), 413
+
 @app.route('/')
 def index():
     """Main page with upload form"""
     return render_template('index.html')
 
+@functools.lru_cache(maxsize=None)
+def get_converter(use_ai):
+    """Get the shared converter for this AI setting, creating it on first use"""
+    # Converters keep no per-project state, so one instance serves every request
+    return EnhancedCodeConverter(use_ai=use_ai, enable_phase2=True)
+
+def save_upload(file, file_path):
+    """Save an uploaded file, returning the SHA-256 of its contents"""
+    digest = hashlib.sha256()
+    spooled_path = getattr(file.stream, 'name', None)
+    if isinstance(spooled_path, str) and os.path.isfile(spooled_path):
+        # Already on disk (see UploadRequest): hash it from the page cache and
+        # hard-link it into the session rather than writing a second copy
+        file.stream.seek(0)
+        while chunk := file.stream.read(1 << 20):
+            digest.update(chunk)
+        try:
+            os.link(spooled_path, file_path)
+            return digest.hexdigest()
+        except OSError:
+            file.stream.seek(0)
+            digest = hashlib.sha256()
+    with open(file_path, 'wb') as out:
+        while chunk := file.stream.read(1 << 20):
+            digest.update(chunk)
+            out.write(chunk)
+    return digest.hexdigest()
+
+def upload_index_path(archive_digest, conversion_type, use_ai):
+    """Index entry naming the session that converted this archive with these options"""
+    key = hashlib.sha256(f'{archive_digest}\0{conversion_type}\0{use_ai}'.encode()).hexdigest()
+    return os.path.join(UPLOAD_INDEX_FOLDER, key)
+
+def find_converted_upload(index_path):
+    """Session id and results of an earlier successful conversion, or None"""
+    try:
+        with open(index_path, 'r') as f:
+            session_id = f.read().strip()
+        with open(os.path.join(UPLOAD_FOLDER, session_id, 'results.json'), 'rb') as f:
+            return session_id, json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _replace_in_strings(value, old, new):
+    """Copy of JSON-style data with old replaced by new in every string and key"""
+    if isinstance(value, str):
+        return value.replace(old, new)
+    if isinstance(value, dict):
+        return {_replace_in_strings(key, old, new): _replace_in_strings(item, old, new)
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [_replace_in_strings(item, old, new) for item in value]
+    return value
+
+def reuse_converted_upload(previous_id, results, session_id):
+    """Give a new session its own links to an earlier session's conversion; its results, or None"""
+    # Each uploader gets their own session id and paths, rather than the
+    # earlier uploader's, while sharing the converted files on disk
+    try:
+        shutil.copytree(os.path.join(CONVERTED_FOLDER, previous_id),
+                        os.path.join(CONVERTED_FOLDER, session_id), copy_function=os.link)
+        shutil.copytree(os.path.join(UPLOAD_FOLDER, previous_id, 'extracted'),
+                        os.path.join(UPLOAD_FOLDER, session_id, 'extracted'), copy_function=os.link)
+    except OSError as e:
+        print(f"Error reusing converted session {previous_id}: {e}")
+        shutil.rmtree(os.path.join(CONVERTED_FOLDER, session_id), ignore_errors=True)
+        shutil.rmtree(os.path.join(UPLOAD_FOLDER, session_id, 'extracted'), ignore_errors=True)
+        return None
+    
+    results = _replace_in_strings(results, previous_id, session_id)
+    write_json_file(os.path.join(UPLOAD_FOLDER, session_id, 'results.json'), results)
+    return results
+
+def convert_session(session_id, project_dir, conversion_type, use_ai, index_path=None):
+    """Convert an uploaded project and store its results; returns the upload response"""
+    converter = get_converter(use_ai)
+    target_dir = os.path.join(CONVERTED_FOLDER, session_id)
+    
+    results = converter.convert_project(project_dir, target_dir, conversion_type)
+    deduplicate_tree(target_dir)
+    print('DEBUG: phase2 in results:', 'phase2' in results)
+    if 'phase2' not in results:
+        print('DEBUG: results keys:', list(results.keys()))
+    # Add Next Steps guidance to results
+    results['next_steps'] = generate_next_steps_guidance(
+        conversion_type, 
+        use_ai, 
+        results.get('files_converted', []), 
+        results.get('errors', [])
+    )
+    
+    # Store results for download
+    results_file = os.path.join(UPLOAD_FOLDER, session_id, 'results.json')
+    write_json_file(results_file, results)
+    if index_path is not None:
+        with open(index_path, 'w') as f:
+            f.write(session_id)
+    
+    return {
+        'success': True,
+        'session_id': session_id,
+        'results': results,
+        'download_url': f'/download/{session_id}'
+    }
+
+def convert_session_in_background(session_id, project_dir, conversion_type, use_ai, index_path=None):
+    """Run convert_session off the request, recording a failure for the status endpoint"""
+    Path(UPLOAD_FOLDER, session_id, 'started').touch()
+    try:
+        convert_session(session_id, project_dir, conversion_type, use_ai, index_path)
+    except Exception as e:
+        app.logger.exception('Background conversion of session %s failed', session_id)
+        write_json_file(os.path.join(UPLOAD_FOLDER, session_id, 'error.json'),
+                        {'success': False, 'error': str(e)})
+
 @app.route('/upload', methods=['POST'])
 def upload_file():
     """Handle file upload and conversion"""
@@ -194,7 +711,20 @@ def upload_file():
         # Save uploaded file
         filename = secure_filename(file.filename)
         file_path = os.path.join(session_dir, filename)
-        file.save(file_path)
+        archive_digest = save_upload(file, file_path)
+        
+        # The same archive converted the same way before: reuse that conversion
+        index_path = upload_index_path(archive_digest, conversion_type, use_ai)
+        previous = find_converted_upload(index_path)
+        results = reuse_converted_upload(*previous, session_id) if previous is not None else None
+        if results is not None:
+            return jsonify({
+                'success': True,
+                'session_id': session_id,
+                'status': 'completed',
+                'results': results,
+                'download_url': f'/download/{session_id}'
+            })
         
         # Extract project
         extract_dir = os.path.join(session_dir, 'extracted')
@@ -205,43 +735,23 @@ def upload_file():
             return redirect(request.url)
         
         # Find the main project directory (handle nested archives)
-        project_dir = extract_dir
-        while True:
-            contents = os.listdir(project_dir)
-            if len(contents) == 1 and os.path.isdir(os.path.join(project_dir, contents[0])):
-                project_dir = os.path.join(project_dir, contents[0])
-            else:
-                break
+        project_dir = find_project_dir(extract_dir)
         
-        # Convert project
-        try:
-            converter = EnhancedCodeConverter(use_ai=use_ai, enable_phase2=True)
-            target_dir = os.path.join(CONVERTED_FOLDER, session_id)
-            
-            results = converter.convert_project(project_dir, target_dir, conversion_type)
-            print('DEBUG: phase2 in results:', 'phase2' in results)
-            if 'phase2' not in results:
-                print('DEBUG: results keys:', list(results.keys()))
-            # Add Next Steps guidance to results
-            results['next_steps'] = generate_next_steps_guidance(
-                conversion_type, 
-                use_ai, 
-                results.get('files_converted', []), 
-                results.get('errors', [])
-            )
-            
-            # Store results for download
-            results_file = os.path.join(session_dir, 'results.json')
-            with open(results_file, 'w') as f:
-                json.dump(results, f, indent=2)
-            
+        if request.form.get('background', 'false') == 'true':
+            # Reply straight away; the client polls the status URL for the results
+            Path(session_dir, 'started').touch()
+            CONVERSION_EXECUTOR.submit(convert_session_in_background, session_id, project_dir,
+                                       conversion_type, use_ai, index_path)
             return jsonify({
                 'success': True,
                 'session_id': session_id,
-                'results': results,
-                'download_url': f'/download/{session_id}'
-            })
-            
+                'status': 'pending',
+                'status_url': f'/status/{session_id}'
+            }), 202
+        
+        # Convert project
+        try:
+            return jsonify(convert_session(session_id, project_dir, conversion_type, use_ai, index_path))
         except Exception as e:
             print('DEBUG: Exception during conversion:', e)
             import traceback
@@ -252,24 +762,89 @@ def upload_file():
     flash('Invalid file type')
     return redirect(request.url)
 
+@app.route('/status/<session_id>')
+def conversion_status(session_id):
+    """Report the state of a background conversion"""
+    # State lives in the session directory, so any worker process can answer
+    session_dir = os.path.join(UPLOAD_FOLDER, session_id)
+    results_file = os.path.join(session_dir, 'results.json')
+    error_file = os.path.join(session_dir, 'error.json')
+    
+    if os.path.exists(results_file):
+        with open(results_file, 'rb') as f:
+            results = json.load(f)
+        return jsonify({
+            'success': True,
+            'status': 'completed',
+            'session_id': session_id,
+            'results': results,
+            'download_url': f'/download/{session_id}'
+        })
+    
+    if os.path.exists(error_file):
+        with open(error_file, 'rb') as f:
+            error = json.load(f)
+        return jsonify({**error, 'status': 'failed', 'session_id': session_id})
+    
+    try:
+        started = os.path.getmtime(os.path.join(session_dir, 'started'))
+    except OSError:
+        started = None
+    if started is not None and time.time() - started > BACKGROUND_CONVERSION_TIMEOUT:
+        return jsonify({
+            'success': False,
+            'status': 'failed',
+            'session_id': session_id,
+            'error': 'Conversion did not finish; it may have been interrupted, please try again'
+        })
+    
+    if os.path.isdir(session_dir) and not session_id.startswith('.'):
+        return jsonify({'success': True, 'status': 'pending', 'session_id': session_id})
+    
+    return jsonify({'success': False, 'error': 'Conversion not found'}), 404
+
 @app.route('/download/<session_id>')
 def download_converted(session_id):
     """Download converted project"""
     converted_dir = os.path.join(CONVERTED_FOLDER, session_id)
-    if not os.path.exists(converted_dir):
+    # Dot names are the shared object and archive stores, not sessions
+    if session_id.startswith('.') or not os.path.exists(converted_dir):
         flash('Converted project not found')
         return redirect(url_for('index'))
     
-    # Create zip file
-    zip_path = os.path.join(CONVERTED_FOLDER, f'{session_id}_converted.zip')
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(converted_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, converted_dir)
-                zipf.write(file_path, arcname)
+    # Converted sources are small and usually fetched over a fast link, so
+    # they are stored as-is unless the client asks for compression
+    compression = zipfile.ZIP_DEFLATED if request.args.get('compress') == '1' else zipfile.ZIP_STORED
+    
+    # Identical trees (the same files, shared through deduplicate_tree) get
+    # the same tag, so it also names the cached archive
+    etag = tree_etag(converted_dir, compression)
+    archive_path = os.path.join(ARCHIVE_CACHE_FOLDER, f'{etag}.zip')
+    download_name = f'converted_project_{session_id}.zip'
+    
+    try:
+        # Mark it recently used, so pruning removes other archives first
+        os.utime(archive_path)
+        # send_file resolves relative paths against the app, not the working directory
+        response = send_file(os.path.abspath(archive_path), mimetype='application/zip', as_attachment=True,
+                             download_name=download_name, etag=etag, conditional=True)
+        response.cache_control.no_cache = True
+        return response
+    except FileNotFoundError:
+        # Not cached yet, or pruned since
+        pass
     
-    return send_file(zip_path, as_attachment=True, download_name=f'converted_project_{session_id}.zip')
+    # Build the zip while it is being sent, keeping a copy for later downloads
+    # Once cached, bound the caches off the request
+    response = Response(tee_to_file(stream_zip(converted_dir, compression), archive_path,
+                                    on_complete=lambda: IO_EXECUTOR.submit(prune_caches)),
+                        mimetype='application/zip')
+    response.headers.set('Content-Disposition', 'attachment', filename=download_name)
+    # A repeated download of an unchanged project gets a 304 and skips
+    # building the archive; clients revalidate every time
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 @app.route('/results/<session_id>')
 def view_results(session_id):
@@ -279,7 +854,8 @@ def view_results(session_id):
         flash('Results not found')
         return redirect(url_for('index'))
     
-    with open(results_file, 'r') as f:
+    # Written as UTF-8 by write_json_file; let json detect it from the bytes
+    with open(results_file, 'rb') as f:
         results = json.load(f)
     
     return render_template('results.html', results=results, session_id=session_id)
@@ -293,7 +869,7 @@ def api_convert():
         return jsonify({'error': 'Missing required parameters'}), 400
     
     try:
-        converter = EnhancedCodeConverter(use_ai=data.get('use_ai', True), enable_phase2=True)
+        converter = get_converter(bool(data.get('use_ai', True)))
         results = converter.convert_project(
             data['source_dir'],
             data['target_dir'],